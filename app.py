@@ -13,11 +13,41 @@ if not check_auth():
 inject_css()
 render_header()
 
-from src.parser import extract_resume_text, extract_sections
+from src.sandbox import ParseError, check_upload_size, parse_upload
 from src.analyzer import full_analysis
+from src.blobstore import store_text
+from src.config import Config
+from src.jobs import DONE, FAILED, QueueFullError, get_job_queue
+
+
+def run_analysis_job(job, resume_bytes: bytes, filename: str, jd_text: str, username: str) -> dict:
+    """Parse + analyze in a job worker; the result outlives the script run that asked for it."""
+    job.progress("📄 Parsing resume...")
+    try:
+        resume_text = parse_upload(resume_bytes, filename)
+    except ParseError as e:
+        raise ParseError(f"Could not parse resume: {e}") from e
+    
+    job.progress(f"🤖 Running AI analysis ({len(resume_text.split())} words parsed)...")
+    result = full_analysis(resume_text, jd_text, filename)
+    
+    # Session keeps refs; the texts live once in the shared store
+    result["resume_text"] = store_text(resume_text)
+    result["jd_text"] = store_text(jd_text)
+    result["filename"] = filename
+    
+    # Count usage AFTER successful analysis
+    increment_usage(username)
+    return result
 
 # --- Sidebar ---
 username = st.session_state.get("username", "guest")
+jobs = get_job_queue()
+
+# A reload starts a new session; the job ID in the URL reconnects it to its job
+if "analysis_job" not in st.session_state:
+    reconnect = jobs.get(st.query_params.get("job", ""))
+    st.session_state.analysis_job = reconnect.id if reconnect and reconnect.owner == username else None
 
 with st.sidebar:
     render_usage_badge()
@@ -33,8 +63,9 @@ with st.sidebar:
     uploaded = st.file_uploader("Upload Resume", type=["pdf", "docx", "txt"])
     
     can_run = can_analyze(username)
+    busy = bool(st.session_state.analysis_job)
     analyze_btn = st.button("🔍 Analyze Match", type="primary", use_container_width=True,
-                            disabled=not (jd_text and uploaded and can_run))
+                            disabled=not (jd_text and uploaded and can_run) or busy)
     
     if not can_run:
         st.warning("🔒 Free limit reached — Upgrade to Pro!")
@@ -49,7 +80,7 @@ with st.sidebar:
     render_sidebar_footer()
 
 # --- Main Content ---
-if not st.session_state.get("analysis_result"):
+if not st.session_state.get("analysis_result") and not st.session_state.analysis_job:
     # Empty state
     st.markdown("""
     <div style="text-align:center; padding:60px 20px;">
@@ -79,37 +110,58 @@ if analyze_btn and jd_text and uploaded:
         render_paywall()
         st.stop()
     
+    try:
+        check_upload_size(uploaded.size)
+    except ParseError as e:
+        st.error(f"❌ {e}")
+        st.stop()
+    
     resume_bytes = uploaded.read()
     
-    with st.status("🔍 Analyzing your resume...", expanded=True) as status:
-        st.write("📄 Parsing resume...")
-        try:
-            resume_text = extract_resume_text(resume_bytes, uploaded.name)
-        except Exception as e:
-            st.error(f"❌ Could not parse resume: {e}")
-            st.stop()
-        
-        st.write(f"✅ Parsed — {len(resume_text.split())} words")
-        st.write("🤖 Running AI analysis...")
-        
-        try:
-            result = full_analysis(resume_text, jd_text, uploaded.name)
-        except Exception as e:
-            st.error(f"❌ Analysis failed: {e}")
-            st.stop()
-        
-        result["resume_text"] = resume_text
-        result["jd_text"] = jd_text
-        result["filename"] = uploaded.name
-        st.session_state.analysis_result = result
-        
-        # Count usage AFTER successful analysis
-        increment_usage(username)
-        
-        status.update(label="✅ Analysis Complete!", state="complete")
+    try:
+        job = jobs.submit(run_analysis_job, resume_bytes, uploaded.name, jd_text, username,
+                          owner=username, kind="analysis")
+    except QueueFullError as e:
+        st.error(f"❌ {e}")
+        st.stop()
     
+    st.session_state.analysis_job = job.id
+    st.session_state.analysis_error = None
+    st.query_params["job"] = job.id
     st.rerun()
 
+
+@st.fragment(run_every=Config.JOB_POLL_INTERVAL)
+def render_job_status(job_id: str):
+    """Poll the running analysis without rerunning (or blocking) the whole page."""
+    job = jobs.get(job_id)
+    if job is None or job.done:
+        st.session_state.analysis_job = None
+        if job is None:
+            st.session_state.analysis_error = "This analysis expired; please run it again."
+        elif job.status == DONE:
+            st.session_state.analysis_result = job.result
+        elif job.status == FAILED:
+            st.session_state.analysis_error = f"Analysis failed: {job.error}"
+        st.rerun()
+    
+    with st.status("🔍 Analyzing your resume...", expanded=True):
+        st.write(job.stage)
+        if job.started is None:
+            st.caption(f"⏳ Queued for {job.wait_seconds:.0f}s — {jobs.stats()['queued']} analyses waiting")
+            if st.button("✖ Cancel", key="cancel_job"):
+                jobs.cancel(job.id)
+        else:
+            st.caption(f"⏱️ {job.run_seconds:.0f}s elapsed")
+
+
+if st.session_state.get("analysis_error"):
+    st.error(f"❌ {st.session_state.analysis_error}")
+    st.session_state.analysis_error = None
+
+if st.session_state.analysis_job:
+    render_job_status(st.session_state.analysis_job)
+
 # --- Display Results ---
 if st.session_state.get("analysis_result"):
     r = st.session_state.analysis_result
@@ -131,7 +183,10 @@ if st.session_state.get("analysis_result"):
         st.markdown(f'<div class="score-card"><div class="score-value">{r["ats"]["score"]}%</div><div class="score-label">ATS Format</div></div>', unsafe_allow_html=True)
     
     # Overall Fit
-    if r.get("overall_fit"):
+    if r.get("llm_skipped"):
+        st.info(f"⚡ **Quick Assessment:** {r['overall_fit']} Experience and education scores are estimates; "
+                "the detailed AI review only runs for resumes that plausibly match the job.")
+    elif r.get("overall_fit"):
         st.info(f"💡 **AI Assessment:** {r['overall_fit']}")
     
     st.divider()
@@ -202,4 +257,5 @@ if st.session_state.get("analysis_result"):
     # New analysis button
     if st.button("🔄 New Analysis", use_container_width=True):
         st.session_state.analysis_result = None
+        st.query_params.pop("job", None)
         st.rerun()
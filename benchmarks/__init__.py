@@ -0,0 +1 @@
+# ResumeMatch AI — benchmarks
@@ -0,0 +1,54 @@
+"""Benchmark — ResumeIndex query latency over a large synthetic corpus.
+
+Run with `python -m benchmarks.bench_index [n_resumes]` (default 1,000,000).
+"""
+
+import random
+import sys
+import time
+
+import numpy as np
+
+from src.index import ResumeIndex
+from src.taxonomy import load_taxonomy
+
+QUERIES = 500
+TAXONOMY = load_taxonomy()
+TECH_SKILLS, SOFT_SKILLS = TAXONOMY.hard_skills, TAXONOMY.soft_skills
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(7)
+    # Skewed popularity: a few skills appear in most resumes
+    weights = [1 / (rank + 1) for rank in range(len(TECH_SKILLS))]
+
+    index = ResumeIndex()
+    start = time.perf_counter()
+    for i in range(n):
+        hard = set(rng.choices(TECH_SKILLS, weights=weights, k=rng.randint(5, 20)))
+        soft = set(rng.sample(SOFT_SKILLS, rng.randint(0, 4)))
+        applied = {s for s in hard if rng.random() < 0.5}
+        index.add_skills(f"resume-{i}", hard | soft, applied)
+    print(f"built {n:,} resumes in {time.perf_counter() - start:.1f}s")
+
+    for i in range(0, n, 100):
+        index.delete(f"resume-{i}")
+    print(f"deleted {n // 100:,} resumes")
+
+    latencies = []
+    for _ in range(QUERIES):
+        query = {
+            "hard_skills": rng.sample(TECH_SKILLS, rng.randint(5, 15)),
+            "soft_skills": rng.sample(SOFT_SKILLS, rng.randint(1, 4)),
+        }
+        start = time.perf_counter()
+        index.search(query, k=20)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    print(f"query latency ms — p50 {p50:.1f}  p95 {p95:.1f}  p99 {p99:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark — per-skill regex loop vs the single-pass SkillMatcher.
+
+Run with `python -m benchmarks.bench_matcher`.
+"""
+
+import random
+import re
+import time
+
+from src.matcher import SkillMatcher
+from src.taxonomy import load_taxonomy
+
+SCALES = [1, 10, 100, 1000]
+TAXONOMY = load_taxonomy()
+TECH_SKILLS, SOFT_SKILLS = TAXONOMY.hard_skills, TAXONOMY.soft_skills
+FILLER = (
+    "we are looking for an engineer to build and operate reliable services "
+    "with strong ownership of design reviews testing and production support"
+).split()
+
+
+def make_vocabulary(scale: int, rng: random.Random) -> list:
+    """Real skills plus synthetic ones, `scale` times the current list size."""
+    vocab = list(TECH_SKILLS)
+    suffixes = ["", ".js", "db", " cloud", "-ml", "++", " studio"]
+    while len(vocab) < len(TECH_SKILLS) * scale:
+        stem = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 9)))
+        vocab.append(stem + rng.choice(suffixes))
+    return list(dict.fromkeys(vocab))
+
+
+def make_text(vocab: list, words: int, rng: random.Random) -> str:
+    """A JD-sized text where roughly one word in eight is a skill."""
+    out = []
+    for _ in range(words):
+        out.append(rng.choice(vocab) if rng.random() < 0.125 else rng.choice(FILLER))
+    return " ".join(out)
+
+
+def legacy_match(text: str, vocab: list) -> list:
+    """The original loop: one regex search per skill."""
+    text = text.lower()
+    return [s for s in vocab if re.search(r'\b' + re.escape(s) + r'\b', text)]
+
+
+def timed(fn, repeat: int) -> float:
+    """Best-of-`repeat` wall time in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'skills':>8} {'build ms':>10} {'legacy ms':>11} {'matcher ms':>11} {'speedup':>9}")
+    for scale in SCALES:
+        vocab = make_vocabulary(scale, rng)
+        text = make_text(vocab, 600, rng)
+
+        start = time.perf_counter()
+        matcher = SkillMatcher(vocab, SOFT_SKILLS)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        repeat = 3 if scale >= 100 else 20
+        legacy_ms = timed(lambda: legacy_match(text, vocab), repeat)
+        matcher_ms = timed(lambda: matcher.find(text), repeat)
+        print(f"{len(vocab):>8} {build_ms:>10.1f} {legacy_ms:>11.2f} {matcher_ms:>11.3f} {legacy_ms / matcher_ms:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Synthetic corpus — deterministic resumes (TXT/DOCX/PDF) and job descriptions.
+
+Everything is derived from a seed, so two runs with the same arguments
+benchmark byte-identical inputs.
+"""
+
+import io
+import random
+import zipfile
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from src.taxonomy import load_taxonomy
+
+FORMATS = ("txt", "docx", "pdf")
+SECTIONS = ["Summary", "Experience", "Projects", "Education", "Skills", "Certifications"]
+FILLER = (
+    "owned delivery of customer facing features across the platform and "
+    "worked with product design and support to ship reliable releases on time "
+    "handled on call rotation wrote design docs reviewed code and improved tooling"
+).split()
+VERBS = ["Developed", "Led", "Built", "Designed", "Improved", "Reduced", "Managed", "Delivered"]
+# Fixed metadata timestamp so generated files are byte-identical across runs
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+NAMES = ["Jane Doe", "Arjun Mehta", "Li Wei", "Maria Garcia", "Sam Okafor", "Priya Nair"]
+
+
+@lru_cache(maxsize=1)
+def _skills():
+    taxonomy = load_taxonomy()
+    return taxonomy.hard_skills, taxonomy.soft_skills
+
+
+def make_resume(rng: random.Random, words: int = 500, skill_density: float = 0.08) -> str:
+    """A resume of about `words` words where `skill_density` of them are skills."""
+    hard, soft = _skills()
+    name = rng.choice(NAMES)
+    lines = [name, f"{name.split()[0].lower()}@example.com | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}"]
+    per_section = max(words // len(SECTIONS), 1)
+    for section in SECTIONS:
+        lines.append(section)
+        count = 0
+        while count < per_section:
+            bullet = [rng.choice(VERBS)]
+            for _ in range(rng.randint(8, 18)):
+                roll = rng.random()
+                if roll < skill_density:
+                    bullet.append(rng.choice(hard) if rng.random() < 0.8 else rng.choice(soft))
+                else:
+                    bullet.append(rng.choice(FILLER))
+            if rng.random() < 0.3:
+                bullet.append(f"by {rng.randint(5, 80)}%")
+            lines.append("- " + " ".join(bullet))
+            count += len(bullet)
+    return "\n".join(lines)
+
+
+def make_jd(rng: random.Random, n_skills: int = 12, words: int = 250) -> str:
+    """A job description asking for `n_skills` skills among `words` words."""
+    hard, soft = _skills()
+    wanted = rng.sample(hard, min(n_skills, len(hard))) + rng.sample(soft, min(3, len(soft)))
+    body = [rng.choice(FILLER) for _ in range(max(words - len(wanted), 0))]
+    for skill in wanted:
+        body.insert(rng.randrange(len(body) + 1), skill)
+    years = rng.randint(2, 8)
+    return (
+        f"Senior Engineer\n\nWe are hiring. Requirements: {years}+ years of experience, "
+        "Bachelor's degree in computer science.\n\n" + " ".join(body)
+    )
+
+
+def render(text: str, fmt: str) -> bytes:
+    """Encode a resume as a txt, docx or pdf file."""
+    if fmt == "txt":
+        return text.encode("utf-8")
+    if fmt == "docx":
+        from docx import Document
+        doc = Document()
+        doc.core_properties.created = doc.core_properties.modified = EPOCH.replace(tzinfo=None)
+        for line in text.split("\n"):
+            doc.add_paragraph(line)
+        buf = io.BytesIO()
+        doc.save(buf)
+        return _fix_zip_times(buf.getvalue())
+    if fmt == "pdf":
+        from fpdf import FPDF
+        pdf = FPDF()
+        pdf.creation_date = EPOCH
+        pdf.set_auto_page_break(True, margin=15)
+        pdf.add_page()
+        pdf.set_font("Helvetica", size=10)
+        for line in text.split("\n"):
+            pdf.multi_cell(0, 5, line.encode("latin-1", "replace").decode("latin-1"), new_x="LMARGIN", new_y="NEXT")
+        return bytes(pdf.output())
+    raise ValueError(f"Unknown format: {fmt}")
+
+
+def _fix_zip_times(data: bytes) -> bytes:
+    """Rewrite a zip (DOCX) with every entry stamped EPOCH."""
+    out = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(data)) as src, zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as dst:
+        for info in src.infolist():
+            entry = zipfile.ZipInfo(info.filename, EPOCH.timetuple()[:6])
+            entry.compress_type = zipfile.ZIP_DEFLATED
+            dst.writestr(entry, src.read(info))
+    return out.getvalue()
+
+
+def make_corpus(n: int = 20, sizes=(300, 800, 2000), formats=FORMATS, skill_density: float = 0.08, seed: int = 0) -> list:
+    """`n` resumes per (size, format), as dicts with name, format, words, text and bytes."""
+    rng = random.Random(seed)
+    corpus = []
+    for words in sizes:
+        for fmt in formats:
+            for i in range(n):
+                text = make_resume(rng, words, skill_density)
+                corpus.append({
+                    "name": f"resume_{words}w_{i}.{fmt}",
+                    "format": fmt,
+                    "words": words,
+                    "text": text,
+                    "bytes": render(text, fmt),
+                })
+    return corpus
+
+
+def make_jds(n: int = 10, n_skills: int = 12, seed: int = 0) -> list:
+    rng = random.Random(seed + 1)
+    return [make_jd(rng, n_skills) for _ in range(n)]
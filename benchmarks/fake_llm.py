@@ -0,0 +1,302 @@
+"""Fake LLM — a local OpenAI-compatible chat-completions server for offline testing.
+
+Run with `python -m benchmarks.fake_llm --port 8089`, then point the app or
+the benchmark suite at it:
+
+    LLM_BASE_URL=http://127.0.0.1:8089/v1 LLM_API_KEY=fake streamlit run app.py
+    python -m benchmarks.suite --llm-url http://127.0.0.1:8089/v1
+
+Requests that ask for JSON (response_format json_object, or a prompt that
+mentions JSON) get a schema-valid resume analysis; anything else gets
+rewrite-style prose. Latency, token rate, and error/429 rates are
+configurable, and streaming uses the same SSE chunks as the real API.
+Standard library only.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = (
+    "led migration of core services to containers cutting deploy time and "
+    "built data pipelines in python with strong test coverage improved api "
+    "latency by 40% mentored engineers and partnered with product on roadmap"
+).split()
+
+
+class FakeLLMConfig:
+    """Behaviour knobs; see `main` for the matching command-line flags."""
+
+    def __init__(self, latency_ms: float = 300, latency_dist: str = "lognormal", sigma: float = 0.5,
+                 tokens_per_sec: float = 80, error_rate: float = 0.0, rate_limit_rate: float = 0.0,
+                 retry_after: float = 1.0, reply_words: int = 120, seed: int = None):
+        self.latency_ms = latency_ms
+        self.latency_dist = latency_dist
+        self.sigma = sigma
+        self.tokens_per_sec = tokens_per_sec
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.reply_words = reply_words
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+
+    def sample_latency(self) -> float:
+        """Time to first token, in seconds."""
+        median = self.latency_ms / 1000
+        with self.rng_lock:
+            if self.latency_dist == "fixed":
+                return median
+            if self.latency_dist == "uniform":
+                return self.rng.uniform(0, 2 * median)
+            if self.latency_dist == "exponential":
+                return self.rng.expovariate(math.log(2) / median) if median else 0.0
+            return self.rng.lognormvariate(math.log(median), self.sigma) if median else 0.0
+
+    def roll(self) -> str:
+        """Outcome for one request: "ok", "error" or "rate_limited"."""
+        with self.rng_lock:
+            r = self.rng.random()
+        if r < self.rate_limit_rate:
+            return "rate_limited"
+        if r < self.rate_limit_rate + self.error_rate:
+            return "error"
+        return "ok"
+
+
+# How the analysis and follow-up prompts ask for JSON ("Output ONLY valid JSON", "Reply with ONLY a JSON object")
+JSON_INSTRUCTION = re.compile(r"\bONLY (?:valid JSON|a JSON object)\b")
+
+
+def _count_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _wants_json(body: dict, prompt: str) -> bool:
+    """JSON mode, or the app's explicit instruction for when JSON mode is off.
+
+    Not just any mention of JSON: resumes and JDs list it as a skill.
+    """
+    fmt = (body.get("response_format") or {}).get("type")
+    return fmt == "json_object" or JSON_INSTRUCTION.search(prompt) is not None
+
+
+def analysis_reply(prompt: str, rng: random.Random) -> str:
+    """Analysis JSON; for follow-ups, only the keys the prompt asks for."""
+    full = {
+        "experience_relevance_score": rng.randint(40, 95),
+        "experience_analysis": "Solid, relevant experience with the core stack.",
+        "education_score": rng.randint(50, 95),
+        "education_analysis": "Degree matches the stated requirement.",
+        "overall_fit": "Strong candidate with a few gaps in the listed tooling.",
+        "top_suggestions": [f"Suggestion {i}: quantify impact in bullet {i}" for i in range(1, 6)],
+        "strengths": ["Backend depth", "Ownership", "Mentoring"],
+        "weaknesses": ["Limited cloud exposure", "Few metrics", "No certifications"],
+    }
+    asked = re.search(r"containing exactly these keys:\s*(\{.*\})", prompt, re.S)
+    if asked:
+        try:
+            keys = json.loads(asked.group(1))
+            return json.dumps({k: full[k] for k in keys if k in full})
+        except ValueError:
+            pass
+    return json.dumps(full)
+
+
+def text_reply(words: int, rng: random.Random) -> str:
+    lines = []
+    while words > 0:
+        n = min(words, rng.randint(10, 18))
+        lines.append("• " + " ".join(rng.choice(WORDS) for _ in range(n)).capitalize())
+        words -= n
+    return "\n".join(lines)
+
+
+def _pieces(text: str):
+    """Split a reply into roughly token-sized stream pieces."""
+    return re.findall(r"\S+\s*|\s+", text)
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = {"requests": 0, "ok": 0, "errors": 0, "rate_limited": 0, "streams": 0, "completion_tokens": 0}
+
+    def add(self, **deltas):
+        with self.lock:
+            for key, value in deltas.items():
+                self.counts[key] += value
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return dict(self.counts)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "FakeLLM/1.0"
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def _json(self, status: int, payload: dict, headers: dict = None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._json(200, {"object": "list", "data": [{"id": self.server.model, "object": "model", "owned_by": "fake"}]})
+        elif self.path.rstrip("/").endswith("/stats"):
+            self._json(200, self.server.stats.snapshot())
+        else:
+            self._json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            return self._json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self._json(400, {"error": {"message": "invalid JSON body", "type": "invalid_request_error"}})
+
+        config, stats = self.server.config, self.server.stats
+        stats.add(requests=1)
+        outcome = config.roll()
+        if outcome == "rate_limited":
+            stats.add(rate_limited=1)
+            return self._json(
+                429,
+                {"error": {"message": "Rate limit reached", "type": "rate_limit_error", "code": "rate_limit_exceeded"}},
+                {"Retry-After": f"{config.retry_after:g}"},
+            )
+        if outcome == "error":
+            stats.add(errors=1)
+            return self._json(500, {"error": {"message": "The server had an error processing your request", "type": "server_error"}})
+
+        messages = body.get("messages") or []
+        prompt = "\n".join(str(m.get("content", "")) for m in messages)
+        # Seed from the prompt so identical requests get identical answers
+        rng = random.Random(hashlib.sha256(prompt.encode()).digest())
+        text = analysis_reply(prompt, rng) if _wants_json(body, prompt) else text_reply(config.reply_words, rng)
+        usage = {
+            "prompt_tokens": _count_tokens(prompt),
+            "completion_tokens": _count_tokens(text),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        stats.add(ok=1, completion_tokens=usage["completion_tokens"])
+
+        time.sleep(config.sample_latency())
+        if body.get("stream"):
+            stats.add(streams=1)
+            include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+            return self._stream(body, text, usage if include_usage else None)
+
+        if config.tokens_per_sec:
+            time.sleep(usage["completion_tokens"] / config.tokens_per_sec)
+        self._json(200, {
+            "id": f"chatcmpl-{rng.getrandbits(64):x}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", self.server.model),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": usage,
+        })
+
+    def _stream(self, body: dict, text: str, usage: dict):
+        """Server-sent events, one chunk per token-sized piece, paced by tokens/sec."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        base = {"id": f"chatcmpl-{int(time.time() * 1000):x}", "object": "chat.completion.chunk",
+                "created": int(time.time()), "model": body.get("model", self.server.model)}
+        delay = 1 / self.server.config.tokens_per_sec if self.server.config.tokens_per_sec else 0
+
+        def send(payload):
+            data = f"data: {payload}\n\n".encode()
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        try:
+            send(json.dumps({**base, "choices": [{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}]}))
+            for piece in _pieces(text):
+                time.sleep(delay)
+                send(json.dumps({**base, "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}))
+            send(json.dumps({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}))
+            if usage:
+                send(json.dumps({**base, "choices": [], "usage": usage}))
+            send("[DONE]")
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # Client went away mid-stream (e.g. a cancelled Streamlit run)
+            self.close_connection = True
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8089, config: FakeLLMConfig = None,
+                model: str = "fake-llm", verbose: bool = False) -> ThreadingHTTPServer:
+    """Build (but don't start) a fake server; port 0 picks a free port."""
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    server.config = config or FakeLLMConfig()
+    server.stats = Stats()
+    server.model = model
+    server.verbose = verbose
+    return server
+
+
+def start_in_thread(**kwargs) -> tuple:
+    """Start a fake server in a daemon thread; returns (server, base_url)."""
+    server = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}/v1"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.fake_llm", description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--model", default="fake-llm", help="model id reported by /v1/models")
+    parser.add_argument("--latency-ms", type=float, default=300, help="median time to first token")
+    parser.add_argument("--latency-dist", choices=["fixed", "uniform", "exponential", "lognormal"], default="lognormal")
+    parser.add_argument("--sigma", type=float, default=0.5, help="lognormal spread")
+    parser.add_argument("--tps", type=float, default=80, help="generated tokens per second (0 = instant)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with HTTP 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of requests answered with HTTP 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--reply-words", type=int, default=120, help="length of non-JSON replies")
+    parser.add_argument("--seed", type=int, default=None, help="seed for latency and error sampling")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    config = FakeLLMConfig(args.latency_ms, args.latency_dist, args.sigma, args.tps, args.error_rate,
+                           args.rate_limit_rate, args.retry_after, args.reply_words, args.seed)
+    server = make_server(args.host, args.port, config, args.model, args.verbose)
+    print(f"fake LLM on http://{args.host}:{server.server_address[1]}/v1 (model {args.model})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("stats:", json.dumps(server.stats.snapshot()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""Benchmark suite — parser and analyzer stages on a synthetic corpus.
+
+Run with `python -m benchmarks.suite` (add `--quick` for a smoke run).
+
+Each stage is timed per call with caches cleared, so the numbers are the
+cold cost a new upload pays. `full_analysis` runs against a stub LLM that
+answers instantly (or after `--llm-latency` seconds) with a fixed JSON
+analysis, or with `--llm-url` against a real endpoint such as
+`benchmarks.fake_llm` for end-to-end numbers. Results can be saved as a
+baseline and later runs compared to it; the exit status is 1 if any stage
+got slower than the tolerance.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.corpus import FORMATS, make_corpus, make_jds
+from src import llm
+from src.analyzer import calculate_keyword_match, check_ats_formatting, full_analysis
+from src.cache import TieredCache
+from src.document import clear_documents
+from src.parser import extract_keywords_from_jd, extract_resume_text, extract_sections, parse_cache
+from src.ratelimit import RateLimiter
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+STUB_ANALYSIS = json.dumps({
+    "experience_relevance_score": 72,
+    "experience_analysis": "Relevant backend experience.",
+    "education_score": 80,
+    "education_analysis": "CS degree.",
+    "overall_fit": "Good fit.",
+    "top_suggestions": ["Quantify impact", "Add cloud certifications"],
+    "strengths": ["Python", "Ownership"],
+    "weaknesses": ["Little frontend work"],
+})
+
+
+class _Message:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class StubLLM:
+    """Stands in for ChatOpenAI: fixed answer, optional latency, no network."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def bind(self, **kwargs):
+        return self
+
+    def invoke(self, messages):
+        time.sleep(self.latency)
+        return _Message(STUB_ANALYSIS)
+
+    async def ainvoke(self, messages):
+        await asyncio.sleep(self.latency)
+        return _Message(STUB_ANALYSIS)
+
+
+def _unlimited():
+    """Take the shared rate limiter out of the measurement."""
+    limiter = RateLimiter(rpm=0, tpm=0, max_concurrency=1000)
+    llm.rate_limiter = lambda: limiter
+
+
+def install_stub_llm(latency: float = 0.0):
+    """Route every LLM call to StubLLM and disable the response cache and rate limits."""
+    stub = StubLLM(latency)
+    llm.get_llm = lambda temperature=0.1, streaming=False: stub
+    llm.llm_cache = TieredCache(maxsize=0)
+    _unlimited()
+
+
+def use_llm_endpoint(base_url: str):
+    """Send LLM calls to `base_url` through the real client, with the response cache and rate limits off."""
+    os.environ["LLM_BASE_URL"] = base_url
+    os.environ.setdefault("LLM_API_KEY", "fake")
+    llm.reset_llm_clients()
+    llm.llm_cache = TieredCache(maxsize=0)
+    _unlimited()
+
+
+def _reset_caches():
+    parse_cache.clear()
+    clear_documents()
+
+
+def _stages(corpus: list, jds: list) -> dict:
+    """Stage name -> list of zero-argument calls, one per input."""
+    jd_keywords = [extract_keywords_from_jd(jd) for jd in jds]
+    pairs = [(doc, jds[i % len(jds)], jd_keywords[i % len(jds)]) for i, doc in enumerate(corpus)]
+    return {
+        "extract_resume_text": [lambda d=d: extract_resume_text(d["bytes"], d["name"]) for d in corpus],
+        "extract_sections": [lambda d=d: extract_sections(d["text"]) for d in corpus],
+        "extract_keywords_from_jd": [lambda jd=jd: extract_keywords_from_jd(jd) for jd in jds],
+        "calculate_keyword_match": [lambda d=d, k=k: calculate_keyword_match(d["text"], k) for d, _, k in pairs],
+        "check_ats_formatting": [lambda d=d: check_ats_formatting(d["text"], d["name"]) for d in corpus],
+        "full_analysis": [lambda d=d, jd=jd: full_analysis(d["text"], jd, d["name"]) for d, jd, _ in pairs],
+    }
+
+
+def run_stage(calls: list, repeat: int = 1, memory_samples: int = 5) -> dict:
+    """Time each call cold; then measure peak traced memory on a few of them."""
+    calls[0]()  # warm imports and compiled patterns
+    times = []
+    for _ in range(repeat):
+        for call in calls:
+            _reset_caches()
+            start = time.perf_counter()
+            call()
+            times.append(time.perf_counter() - start)
+
+    peak = 0
+    for call in calls[:memory_samples]:
+        _reset_caches()
+        tracemalloc.start()
+        call()
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    ms = np.array(times) * 1000
+    return {
+        "calls": len(times),
+        "ops_per_sec": round(len(times) / (ms.sum() / 1000), 1),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Stages whose p50 latency or peak memory regressed beyond `tolerance`."""
+    regressions = []
+    for stage, now in results.items():
+        before = baseline.get("stages", {}).get(stage)
+        if not before:
+            continue
+        for metric in ("p50_ms", "peak_kb"):
+            if before[metric] and now[metric] > before[metric] * (1 + tolerance):
+                regressions.append(f"{stage}: {metric} {before[metric]} -> {now[metric]} (+{now[metric] / before[metric] - 1:.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=10, help="resumes per size and format")
+    parser.add_argument("--sizes", default="300,800,2000", help="resume sizes in words, comma-separated")
+    parser.add_argument("--formats", default=",".join(FORMATS), help="file formats, comma-separated")
+    parser.add_argument("--density", type=float, default=0.08, help="share of resume words that are skills")
+    parser.add_argument("--jds", type=int, default=10, help="number of job descriptions")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="timed passes over the corpus")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="stub LLM delay in seconds")
+    parser.add_argument("--llm-url", default="", help="OpenAI-compatible base URL to use instead of the stub")
+    parser.add_argument("--only", default="", help="comma-separated stage names to run")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare with / save to")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before failing")
+    parser.add_argument("--quick", action="store_true", help="tiny corpus, for checking the suite itself")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.n, args.sizes, args.jds = 2, "300", 2
+    sizes = [int(s) for s in args.sizes.split(",")]
+    formats = [f for f in args.formats.split(",") if f]
+
+    if args.llm_url:
+        use_llm_endpoint(args.llm_url)
+    else:
+        install_stub_llm(args.llm_latency)
+    start = time.perf_counter()
+    corpus = make_corpus(args.n, sizes, formats, args.density, args.seed)
+    jds = make_jds(args.jds, seed=args.seed)
+    print(f"corpus: {len(corpus)} resumes, {len(jds)} JDs ({time.perf_counter() - start:.1f}s to generate)\n")
+
+    stages = _stages(corpus, jds)
+    only = [s for s in args.only.split(",") if s]
+    results = {}
+    print(f"{'stage':<26} {'ops/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak KB':>9}")
+    for name, calls in stages.items():
+        if only and name not in only:
+            continue
+        r = results[name] = run_stage(calls, args.repeat)
+        print(f"{name:<26} {r['ops_per_sec']:>9} {r['p50_ms']:>9} {r['p95_ms']:>9} {r['p99_ms']:>9} {r['peak_kb']:>9}")
+
+    run = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "params": {k: getattr(args, k) for k in ("n", "sizes", "formats", "density", "jds", "seed", "repeat", "llm_latency", "llm_url")},
+        "stages": results,
+    }
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2)
+        print(f"\nbaseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("\nno baseline yet; run with --save-baseline to store one")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("params") != run["params"]:
+        print("\nwarning: baseline was recorded with different parameters", baseline.get("params"))
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\nREGRESSIONS vs baseline from {baseline.get('created')}:")
+        for line in regressions:
+            print("  " + line)
+        return 1
+    print(f"\nno regressions vs baseline from {baseline.get('created')} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
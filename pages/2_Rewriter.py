@@ -4,7 +4,7 @@ import streamlit as st
 
 st.set_page_config(page_title="ResumeMatch AI — Rewriter", page_icon="📄", layout="wide")
 
-from src.ui import check_auth, inject_css, render_header, render_sidebar_footer
+from src.ui import check_auth, inject_css, render_header, render_sidebar_footer, stream_text
 from src.billing import get_usage, render_paywall, render_usage_badge
 
 if not check_auth():
@@ -26,8 +26,10 @@ if not usage["is_pro"]:
     render_paywall()
     st.stop()
 
-from src.parser import extract_sections
-from src.rewriter import rewrite_section, generate_summary
+from src.blobstore import resolve, store_text
+from src.document import get_document
+from src.prompt import PromptTooLongError
+from src.rewriter import iter_rewrite_sections, stream_rewrite_section, stream_summary
 
 # --- Check if analysis exists ---
 if not st.session_state.get("analysis_result"):
@@ -35,16 +37,16 @@ if not st.session_state.get("analysis_result"):
     st.stop()
 
 r = st.session_state.analysis_result
-resume_text = r.get("resume_text", "")
-jd_text = r.get("jd_text", "")
+resume_text = resolve(r.get("resume_text"))
+jd_text = resolve(r.get("jd_text"))
 missing_skills = r.get("hard_skills", {}).get("missing", [])
 
 # --- Page Header ---
 st.markdown("### ✍️ AI Resume Rewriter")
 st.caption("Side-by-side comparison — original vs AI-optimized for this job")
 
-# --- Get sections ---
-sections = extract_sections(resume_text)
+# --- Get sections (copied: the shared document is read-only) ---
+sections = dict(get_document(resume_text).sections)
 
 if not sections:
     st.error("Could not parse resume sections. Try a different resume format.")
@@ -53,13 +55,12 @@ if not sections:
 # --- Generate Summary if missing ---
 if "summary" not in sections:
     if st.button("✨ Generate Professional Summary", type="primary"):
-        with st.spinner("Generating summary..."):
-            summary = generate_summary(resume_text, jd_text)
-            sections["summary"] = ""
-            if "rewritten_sections" not in st.session_state:
-                st.session_state.rewritten_sections = {}
-            st.session_state.rewritten_sections["summary"] = summary
-            st.rerun()
+        summary = stream_text(st.container(), stream_summary(resume_text, jd_text))
+        sections["summary"] = ""
+        if "rewritten_sections" not in st.session_state:
+            st.session_state.rewritten_sections = {}
+        st.session_state.rewritten_sections["summary"] = store_text(summary)
+        st.rerun()
 
 # --- Initialize rewritten sections ---
 if "rewritten_sections" not in st.session_state:
@@ -73,7 +74,7 @@ for section_name in rewrite_order:
         continue
     
     original = sections.get(section_name, "")
-    rewritten = st.session_state.rewritten_sections.get(section_name, "")
+    rewritten = resolve(st.session_state.rewritten_sections.get(section_name))
     
     st.markdown(f"---")
     st.markdown(f"### {section_name.title()}")
@@ -93,17 +94,19 @@ for section_name in rewrite_order:
     
     with col2:
         st.markdown("**✨ AI Rewritten**")
+        slot = st.empty()
         if rewritten:
-            edited = st.text_area(
+            edited = slot.text_area(
                 f"Rewritten {section_name}",
                 value=rewritten,
                 height=200,
                 key=f"rewrite_{section_name}",
                 label_visibility="collapsed",
             )
-            st.session_state.rewritten_sections[section_name] = edited
+            if edited != rewritten:
+                st.session_state.rewritten_sections[section_name] = store_text(edited)
         else:
-            st.text_area(
+            slot.text_area(
                 f"Rewritten {section_name}",
                 value="Click 'Rewrite' to generate →",
                 height=200,
@@ -114,9 +117,13 @@ for section_name in rewrite_order:
     
     if original and not rewritten:
         if st.button(f"✍️ Rewrite {section_name.title()}", key=f"btn_{section_name}", use_container_width=True):
-            with st.spinner(f"Rewriting {section_name}..."):
-                result = rewrite_section(section_name, original, jd_text, missing_skills)
-                st.session_state.rewritten_sections[section_name] = result
+            # Stream tokens into the right-hand column as they arrive
+            try:
+                result = stream_text(slot.container(), stream_rewrite_section(section_name, original, jd_text, missing_skills))
+            except PromptTooLongError as e:
+                st.error(str(e))
+            else:
+                st.session_state.rewritten_sections[section_name] = store_text(result)
                 st.rerun()
 
 st.divider()
@@ -125,11 +132,24 @@ st.divider()
 unrewritten = [s for s in rewrite_order if s in sections and s not in st.session_state.rewritten_sections]
 if unrewritten:
     if st.button("🚀 Rewrite All Sections", type="primary", use_container_width=True):
-        for section_name in unrewritten:
-            with st.spinner(f"Rewriting {section_name}..."):
-                result = rewrite_section(section_name, sections[section_name], jd_text, missing_skills)
-                st.session_state.rewritten_sections[section_name] = result
-        st.rerun()
+        todo = {s: sections[s] for s in unrewritten}
+        failed = []
+        with st.status(f"Rewriting {len(todo)} sections...", expanded=True) as status:
+            progress = st.progress(0.0)
+            for done, (section_name, result, error) in enumerate(iter_rewrite_sections(todo, jd_text, missing_skills), 1):
+                if error is None:
+                    st.session_state.rewritten_sections[section_name] = store_text(result)
+                    st.write(f"✅ {section_name.title()}")
+                else:
+                    failed.append(section_name)
+                    st.write(f"❌ {section_name.title()} — {error}")
+                progress.progress(done / len(todo))
+            if failed:
+                status.update(label=f"⚠️ {len(failed)} section(s) failed — retry them individually", state="error")
+            else:
+                status.update(label="✅ All sections rewritten!", state="complete")
+        if not failed:
+            st.rerun()
 
 # --- Download ---
 if st.session_state.rewritten_sections:
@@ -145,7 +165,7 @@ if st.session_state.rewritten_sections:
     md += "\n\n---\n\n"
     
     for section_name in rewrite_order:
-        text = st.session_state.rewritten_sections.get(section_name, sections.get(section_name, ""))
+        text = resolve(st.session_state.rewritten_sections.get(section_name, sections.get(section_name, "")))
         if text:
             md += f"## {section_name.title()}\n\n{text}\n\n"
     
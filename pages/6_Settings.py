@@ -7,6 +7,11 @@ st.set_page_config(page_title="ResumeMatch AI — Settings", page_icon="📄", l
 
 from src.ui import check_auth, inject_css, render_header, render_sidebar_footer
 from src.billing import render_usage_badge, render_pricing_card, get_usage
+from src.blobstore import blob_store, session_memory
+from src.document import memory_footprint
+from src.analyzer import llm_skip_rate
+from src.jobs import get_job_queue
+from src.llm import rate_limiter, reset_llm_clients
 
 if not check_auth():
     st.stop()
@@ -35,15 +40,63 @@ with c2:
     api_key = st.text_input("API Key", type="password", value=os.getenv("LLM_API_KEY", ""))
 
 if st.button("💾 Save", type="primary", use_container_width=True):
-    if api_key: os.environ["LLM_API_KEY"] = api_key
-    if base_url: os.environ["LLM_BASE_URL"] = base_url
-    if model: os.environ["LLM_MODEL"] = model
+    saved = {"LLM_API_KEY": api_key, "LLM_BASE_URL": base_url, "LLM_MODEL": model}
+    changed = {k: v for k, v in saved.items() if v and os.getenv(k) != v}
+    os.environ.update(changed)
+    # Other sessions and background jobs share the clients; keep them unless the provider really changed
+    if changed:
+        reset_llm_clients()
     st.success("✅ Saved!")
 
 st.divider()
 st.markdown("### 📋 Current Config")
 st.code(f"Provider: {provider}\nBase URL: {os.getenv('LLM_BASE_URL', url)}\nModel: {os.getenv('LLM_MODEL', 'mistral-large-3:675b')}\nAPI Key: {'●●●●' if os.getenv('LLM_API_KEY') else '⚠️ Not set'}")
 
+# --- Memory ---
+st.divider()
+st.markdown("### 🧠 Memory")
+mem = session_memory(st.session_state)
+store = blob_store.stats()
+c1, c2, c3 = st.columns(3)
+c1.metric("This session", f"{mem['own_bytes'] / 1024:.0f} KB", help="State only this session holds")
+c2.metric("Shared texts referenced", f"{mem['shared_bytes'] / 1024:.0f} KB", help=f"{mem['blobs']} deduplicated texts")
+c3.metric("Store (all sessions)", f"{store['live_bytes'] / 2**20:.1f} MB",
+          help=f"{store['live_blobs']} live texts, {store['bytes_saved'] / 2**20:.1f} MB saved by deduplication")
+footprint = memory_footprint()
+c1, c2, c3, c4 = st.columns(4)
+c1.metric("Texts (live + pooled)", f"{footprint['blob_bytes'] / 2**20:.1f} MB")
+c2.metric("Parse cache", f"{footprint['parse_cache_bytes'] / 2**20:.1f} MB",
+          help="Parsed texts, sections and contact info not already counted as texts")
+c3.metric("Resume documents", f"{footprint['document_bytes'] / 2**20:.1f} MB",
+          help=f"{footprint['documents']} cached documents: lowercased text, tokens, sections and other views")
+c4.metric("Process total", f"{footprint['total_bytes'] / 2**20:.1f} MB", help="Each object counted once")
+
+# --- Rate Limits ---
+st.divider()
+st.markdown("### 🚦 LLM Rate Limits")
+limits = rate_limiter().stats()
+c1, c2, c3, c4 = st.columns(4)
+c1.metric("Concurrency", f"{limits['in_flight']}/{limits['concurrency_limit']}",
+          help=f"Calls in flight / current adaptive limit (max {limits['max_concurrency']})")
+c2.metric("Waiting", limits["waiting"], help="Calls queued for a slot or for rate budget")
+c3.metric("Requests left", "∞" if limits["rpm"] is None else limits["requests_available"],
+          help=f"Of {limits['rpm']:g} per minute" if limits["rpm"] else "No requests-per-minute limit")
+c4.metric("Tokens left", "∞" if limits["tpm"] is None else f"{limits['tokens_available']:,}",
+          help=f"Of {limits['tpm']:,.0f} per minute" if limits["tpm"] else "No tokens-per-minute limit")
+if limits["paused_for"]:
+    st.warning(f"⏸️ Provider asked us to slow down — paused for {limits['paused_for']}s")
+
+# --- Background Jobs ---
+st.divider()
+st.markdown("### ⏳ Analysis Queue")
+jobs = get_job_queue().stats()
+c1, c2, c3, c4 = st.columns(4)
+c1.metric("Waiting", jobs["queued"], help=f"Oldest has waited {jobs['oldest_wait']:.0f}s")
+c2.metric("Running", f"{jobs['running']}/{jobs['workers']}", help="Analyses in progress / worker threads")
+c3.metric("Avg wait / run", f"{jobs['avg_wait']:.1f}s / {jobs['avg_run']:.1f}s",
+          help=f"Over {jobs['finished_last_hour']} analyses finished in the last hour")
+c4.metric("LLM calls skipped", f"{llm_skip_rate():.0%}", help="Analyses answered locally because the resume barely matched the JD")
+
 # --- Billing Section ---
 st.divider()
 username = st.session_state.get("username", "guest")
@@ -1,34 +1,49 @@
 """Analyzer Agent — calculates match score between resume and job description."""
 
+import json
 import re
-from langchain_core.messages import HumanMessage, SystemMessage
-from src.llm import get_llm
-from src.parser import extract_sections, extract_keywords_from_jd, extract_contact_info
+import asyncio
+from functools import lru_cache
+import numpy as np
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from src import metrics
+from src.config import Config
+from src.document import ResumeDocument, as_document
+from src.llm import acomplete, complete, run_sync
+from src.matcher import SkillMatcher
+from src.parser import extract_keywords_from_jd, get_skill_matcher
+from src.prompt import PromptBuilder
+from src.relevance import score_relevance
+from src.structured import followup_prompt, repair_json, validate_fields
 
 
-def calculate_keyword_match(resume_text: str, jd_keywords: dict) -> dict:
-    """Calculate keyword match between resume and JD."""
-    resume_lower = resume_text.lower()
+def _matcher_for(hard_skills: list, soft_skills: list) -> SkillMatcher:
+    """Default matcher, or an ad-hoc one if the JD keywords go beyond its vocabulary."""
+    matcher = get_skill_matcher()
+    if all(s in matcher for s in hard_skills) and all(s in matcher for s in soft_skills):
+        return matcher
+    return _custom_matcher(tuple(hard_skills), tuple(soft_skills))
+
+
+@lru_cache(maxsize=32)
+def _custom_matcher(hard_skills: tuple, soft_skills: tuple) -> SkillMatcher:
+    return SkillMatcher(hard_skills, soft_skills)
+
+
+def calculate_keyword_match(resume, jd_keywords: dict) -> dict:
+    """Calculate keyword match between resume (text or ResumeDocument) and JD."""
+    doc = as_document(resume)
+    present = _matcher_for(jd_keywords["hard_skills"], jd_keywords["soft_skills"]).find(doc.lower, lowered=True)
     
     # Hard skills match
-    found_hard = []
-    missing_hard = []
-    for skill in jd_keywords["hard_skills"]:
-        if re.search(r'\b' + re.escape(skill) + r'\b', resume_lower):
-            found_hard.append(skill)
-        else:
-            missing_hard.append(skill)
+    found_hard = [s for s in jd_keywords["hard_skills"] if s in present]
+    missing_hard = [s for s in jd_keywords["hard_skills"] if s not in present]
     
     hard_score = (len(found_hard) / max(len(jd_keywords["hard_skills"]), 1)) * 100
     
     # Soft skills match
-    found_soft = []
-    missing_soft = []
-    for skill in jd_keywords["soft_skills"]:
-        if skill in resume_lower:
-            found_soft.append(skill)
-        else:
-            missing_soft.append(skill)
+    found_soft = [s for s in jd_keywords["soft_skills"] if s in present]
+    missing_soft = [s for s in jd_keywords["soft_skills"] if s not in present]
     
     soft_score = (len(found_soft) / max(len(jd_keywords["soft_skills"]), 1)) * 100
     
@@ -38,171 +53,285 @@ def calculate_keyword_match(resume_text: str, jd_keywords: dict) -> dict:
     }
 
 
-def check_ats_formatting(resume_text: str, filename: str) -> dict:
-    """Check ATS compatibility of resume formatting."""
+REQUIRED_SECTIONS = ["experience", "education", "skills"]
+
+# Expected analysis fields and how to validate them (see src.structured)
+ANALYSIS_FIELDS = {
+    "experience_relevance_score": "score",
+    "experience_analysis": "text",
+    "education_score": "score",
+    "education_analysis": "text",
+    "overall_fit": "text",
+    "top_suggestions": "list",
+    "strengths": "list",
+    "weaknesses": "list",
+}
+
+# Used for fields the model still didn't deliver after follow-ups
+ANALYSIS_DEFAULTS = {
+    "experience_relevance_score": 50,
+    "experience_analysis": "Could not analyze — try again",
+    "education_score": 50,
+    "education_analysis": "Could not analyze",
+    "overall_fit": "",
+    "top_suggestions": ["Ensure resume matches job keywords"],
+    "strengths": ["Resume submitted for analysis"],
+    "weaknesses": ["Analysis incomplete — try again"],
+}
+
+# Highest first; used to estimate education when the LLM is skipped
+DEGREE_PATTERNS = [
+    ("PhD", re.compile(r"\b(?:ph\.?d|doctorate)(?!\w)")),
+    ("Master's", re.compile(r"\b(?:masters?|master's|m\.?sc|m\.?tech|mba|m\.s\.)(?!\w)")),
+    ("Bachelor's", re.compile(r"\b(?:bachelors?|bachelor's|b\.?sc|b\.?tech|b\.s\.|b\.a\.|b\.e\.)(?!\w)")),
+]
+DEGREE_RANK = {"Bachelor's": 1, "Master's": 2, "PhD": 3}
+# Estimated experience scores for skipped analyses stay at or below this
+SKIPPED_EXPERIENCE_CAP = 40
+
+ANALYSIS_PROMPT = """You are an expert ATS resume analyzer. Analyze this resume against the job description.
+
+JOB DESCRIPTION:
+{jd_text}
+
+RESUME:
+{resume_text}
+
+Provide a JSON response with EXACTLY this structure (no markdown, just raw JSON):
+{{
+    "experience_relevance_score": <0-100>,
+    "experience_analysis": "<brief analysis>",
+    "education_score": <0-100>,
+    "education_analysis": "<brief analysis>",
+    "overall_fit": "<1-2 sentence summary>",
+    "top_suggestions": [
+        "<suggestion 1>",
+        "<suggestion 2>",
+        "<suggestion 3>",
+        "<suggestion 4>",
+        "<suggestion 5>"
+    ],
+    "strengths": [
+        "<strength 1>",
+        "<strength 2>",
+        "<strength 3>"
+    ],
+    "weaknesses": [
+        "<weakness 1>",
+        "<weakness 2>",
+        "<weakness 3>"
+    ]
+}}
+
+Output ONLY valid JSON. No explanation, no markdown."""
+
+
+def _ats_features(doc: ResumeDocument, filename: str) -> dict:
+    """Raw signals the ATS score is computed from."""
+    sections = doc.sections
+    return {
+        "file_type_ok": filename.lower().endswith(('.pdf', '.docx')),
+        "word_count": doc.word_count,
+        "contact": doc.contact,
+        "sections": list(sections.keys()),
+        "missing_sections": [sec for sec in REQUIRED_SECTIONS if sec not in sections],
+        "action_verbs": doc.action_verbs,
+        "has_metrics": bool(doc.metrics),
+    }
+
+
+def _ats_score(file_type_ok, word_count, has_email, has_phone, missing_sections, verb_count, has_metrics):
+    """ATS score from features — works on scalars and on NumPy arrays alike."""
+    score = (
+        100
+        - 15 * (1 - file_type_ok)
+        - 20 * (word_count < 150)
+        - 10 * (word_count > 1200)
+        - 15 * (1 - has_email)
+        - 10 * (1 - has_phone)
+        - 10 * missing_sections
+        - 10 * (verb_count < 3)
+        - 10 * (1 - has_metrics)
+    )
+    return np.maximum(score, 0)
+
+
+def _overall_score(hard_score, exp_score, edu_score, ats_score, soft_score):
+    """Weighted average of the five sub-scores."""
+    return (
+        hard_score * 0.35 +
+        exp_score * 0.30 +
+        edu_score * 0.10 +
+        ats_score * 0.15 +
+        soft_score * 0.10
+    )
+
+
+def check_ats_formatting(resume, filename: str) -> dict:
+    """Check ATS compatibility of resume formatting (text or ResumeDocument)."""
+    features = _ats_features(as_document(resume), filename)
+    contact = features["contact"]
+    word_count = features["word_count"]
     issues = []
-    score = 100
     
     # Check file type
-    if filename.lower().endswith('.pdf'):
-        file_type_ok = True
-    elif filename.lower().endswith('.docx'):
-        file_type_ok = True
-    else:
-        file_type_ok = False
+    if not features["file_type_ok"]:
         issues.append("Use PDF or DOCX format for best ATS compatibility")
-        score -= 15
     
     # Check length
-    word_count = len(resume_text.split())
     if word_count < 150:
         issues.append(f"Resume too short ({word_count} words). Aim for 400-800 words.")
-        score -= 20
     elif word_count > 1200:
         issues.append(f"Resume too long ({word_count} words). Keep it under 800 words for 1 page.")
-        score -= 10
     
     # Check for contact info
-    contact = extract_contact_info(resume_text)
     if not contact["email"]:
         issues.append("No email found — ATS needs this")
-        score -= 15
     if not contact["phone"]:
         issues.append("No phone number found")
-        score -= 10
     
     # Check for common sections
-    sections = extract_sections(resume_text)
-    required = ["experience", "education", "skills"]
-    for sec in required:
-        if sec not in sections:
-            issues.append(f"Missing '{sec.title()}' section — most ATS look for this")
-            score -= 10
+    for sec in features["missing_sections"]:
+        issues.append(f"Missing '{sec.title()}' section — most ATS look for this")
     
     # Check for action verbs
-    action_verbs = ["managed", "developed", "led", "created", "implemented", "designed",
-                    "built", "improved", "reduced", "increased", "achieved", "delivered"]
-    found_verbs = [v for v in action_verbs if v in resume_text.lower()]
-    if len(found_verbs) < 3:
+    if len(features["action_verbs"]) < 3:
         issues.append("Add more action verbs (managed, developed, led, improved...)")
-        score -= 10
     
     # Check for quantified achievements
-    has_numbers = bool(re.findall(r'\d+%|\$\d+|\d+\+', resume_text))
-    if not has_numbers:
+    if not features["has_metrics"]:
         issues.append("Add quantified achievements (e.g., 'improved performance by 35%')")
-        score -= 10
+    
+    score = _ats_score(
+        features["file_type_ok"], word_count, bool(contact["email"]), bool(contact["phone"]),
+        len(features["missing_sections"]), len(features["action_verbs"]), features["has_metrics"],
+    )
     
     return {
-        "score": max(score, 0),
-        "file_type_ok": file_type_ok,
+        "score": int(score),
+        "file_type_ok": features["file_type_ok"],
         "word_count": word_count,
         "contact": contact,
-        "sections_found": list(sections.keys()),
-        "action_verbs_found": found_verbs,
-        "has_metrics": has_numbers,
+        "sections_found": features["sections"],
+        "action_verbs_found": features["action_verbs"],
+        "has_metrics": features["has_metrics"],
         "issues": issues,
     }
 
 
+def _analysis_messages(resume_text: str, jd_text: str) -> list:
+    """Prompt for the LLM deep analysis, fitted to the token budget."""
+    prompt = (
+        PromptBuilder(ANALYSIS_PROMPT, budget=Config.LLM_PROMPT_BUDGET)
+        .add("jd_text", jd_text, priority=2, max_tokens=Config.LLM_PROMPT_BUDGET // 3)
+        .add("resume_text", resume_text, priority=1)
+        .render()
+    )
+
+    return [
+        SystemMessage(content="You are an ATS resume expert. Output ONLY valid JSON."),
+        HumanMessage(content=prompt)
+    ]
+
+
 def analyze_with_llm(resume_text: str, jd_text: str) -> dict:
     """Use LLM for deep analysis — experience relevance, suggestions."""
-    llm = get_llm()
+    messages = _analysis_messages(resume_text, jd_text)
+    text = complete(messages, validate=_is_parseable, json_mode=True)
+    result, missing = _check_analysis(text)
+    
+    # Re-request only what is missing or invalid
+    for _ in range(Config.LLM_REPAIR_ATTEMPTS):
+        if not missing:
+            break
+        metrics.incr("analysis.followups")
+        followup = complete(_followup_messages(messages, text, missing), validate=_is_parseable, json_mode=True)
+        result, missing = _merge_followup(result, missing, followup)
     
-    prompt = f"""You are an expert ATS resume analyzer. Analyze this resume against the job description.
+    return _finish_analysis(result, missing)
 
-JOB DESCRIPTION:
-{jd_text[:3000]}
 
-RESUME:
-{resume_text[:3000]}
+async def analyze_with_llm_async(resume_text: str, jd_text: str) -> dict:
+    """Async `analyze_with_llm`."""
+    messages = _analysis_messages(resume_text, jd_text)
+    text = await acomplete(messages, validate=_is_parseable, json_mode=True)
+    result, missing = _check_analysis(text)
+    
+    for _ in range(Config.LLM_REPAIR_ATTEMPTS):
+        if not missing:
+            break
+        metrics.incr("analysis.followups")
+        followup = await acomplete(_followup_messages(messages, text, missing), validate=_is_parseable, json_mode=True)
+        result, missing = _merge_followup(result, missing, followup)
+    
+    return _finish_analysis(result, missing)
 
-Provide a JSON response with EXACTLY this structure (no markdown, just raw JSON):
-{{
-    "experience_relevance_score": <0-100>,
-    "experience_analysis": "<brief analysis>",
-    "education_score": <0-100>,
-    "education_analysis": "<brief analysis>",
-    "overall_fit": "<1-2 sentence summary>",
-    "top_suggestions": [
-        "<suggestion 1>",
-        "<suggestion 2>",
-        "<suggestion 3>",
-        "<suggestion 4>",
-        "<suggestion 5>"
-    ],
-    "strengths": [
-        "<strength 1>",
-        "<strength 2>",
-        "<strength 3>"
-    ],
-    "weaknesses": [
-        "<weakness 1>",
-        "<weakness 2>",
-        "<weakness 3>"
-    ]
-}}
 
-Output ONLY valid JSON. No explanation, no markdown."""
+def _is_parseable(text: str) -> bool:
+    return repair_json(text) is not None
 
-    response = llm.invoke([
-        SystemMessage(content="You are an ATS resume expert. Output ONLY valid JSON."),
-        HumanMessage(content=prompt)
-    ])
-    
-    # Parse JSON from response
-    import json
+
+def _check_analysis(text: str) -> tuple:
+    """Parse (repairing if needed) and validate the model's analysis JSON."""
+    metrics.incr("analysis.responses")
     try:
-        # Try to extract JSON from response
-        text = response.content.strip()
-        # Remove markdown code blocks if present
-        if text.startswith("```"):
-            text = text.split("```")[1]
-            if text.startswith("json"):
-                text = text[4:]
-        result = json.loads(text.strip())
-        return result
-    except (json.JSONDecodeError, IndexError):
-        return {
-            "experience_relevance_score": 50,
-            "experience_analysis": "Could not analyze — try again",
-            "education_score": 50,
-            "education_analysis": "Could not analyze",
-            "overall_fit": response.content[:200],
-            "top_suggestions": ["Ensure resume matches job keywords"],
-            "strengths": ["Resume submitted for analysis"],
-            "weaknesses": ["Analysis incomplete — try again"],
-        }
+        data = json.loads(text.strip())
+    except json.JSONDecodeError:
+        metrics.incr("analysis.parse_failures")
+        data = repair_json(text)
+        if data is not None:
+            metrics.incr("analysis.repaired")
+    result, missing = validate_fields(data, ANALYSIS_FIELDS)
+    if missing:
+        metrics.incr("analysis.invalid_fields", len(missing))
+    return result, missing
 
 
-def full_analysis(resume_text: str, jd_text: str, filename: str) -> dict:
-    """Run complete analysis: keywords + ATS + LLM deep analysis."""
+def _followup_messages(messages: list, answer: str, missing: list) -> list:
+    """The original conversation plus a short request for the missing fields."""
+    return messages + [
+        AIMessage(content=answer),
+        HumanMessage(content=followup_prompt(missing, ANALYSIS_FIELDS)),
+    ]
+
+
+def _merge_followup(result: dict, missing: list, text: str) -> tuple:
+    """Fold a follow-up answer into the partial result."""
+    patch, still_missing = validate_fields(repair_json(text), {f: ANALYSIS_FIELDS[f] for f in missing})
+    return {**result, **patch}, still_missing
+
+
+def _finish_analysis(result: dict, missing: list) -> dict:
+    """Fill whatever is still missing with placeholders."""
+    if missing:
+        metrics.incr("analysis.incomplete")
+    return {**{f: ANALYSIS_DEFAULTS[f] for f in missing}, **result}
+
+
+def _local_checks(resume_text: str, jd_text: str, filename: str) -> tuple:
+    """The regex/ATS stages that don't need the LLM."""
     # 1. Extract JD keywords
     jd_keywords = extract_keywords_from_jd(jd_text)
     
-    # 2. Keyword matching
-    keyword_match = calculate_keyword_match(resume_text, jd_keywords)
+    # 2. Keyword matching, on a resume parsed once for both checks
+    doc = as_document(resume_text)
+    keyword_match = calculate_keyword_match(doc, jd_keywords)
     
     # 3. ATS formatting check
-    ats_check = check_ats_formatting(resume_text, filename)
-    
-    # 4. LLM deep analysis
-    llm_analysis = analyze_with_llm(resume_text, jd_text)
+    ats_check = check_ats_formatting(doc, filename)
     
-    # 5. Calculate overall score
+    return jd_keywords, keyword_match, ats_check
+
+
+def _combine(jd_keywords: dict, keyword_match: dict, ats_check: dict, llm_analysis: dict) -> dict:
+    """Build the full analysis result from its stages."""
     hard_score = keyword_match["hard_skills"]["score"]
     exp_score = llm_analysis.get("experience_relevance_score", 50)
     edu_score = llm_analysis.get("education_score", 50)
     ats_score = ats_check["score"]
     
     # Weighted average
-    overall = round(
-        hard_score * 0.35 +
-        exp_score * 0.30 +
-        edu_score * 0.10 +
-        ats_score * 0.15 +
-        keyword_match["soft_skills"]["score"] * 0.10
-    )
+    overall = round(_overall_score(hard_score, exp_score, edu_score, ats_score, keyword_match["soft_skills"]["score"]))
     
     return {
         "overall_score": overall,
@@ -224,3 +353,157 @@ def full_analysis(resume_text: str, jd_text: str, filename: str) -> dict:
         "jd_keywords": jd_keywords,
         "contact": ats_check["contact"],
     }
+
+
+def _estimated_analysis(doc: ResumeDocument, jd_text: str, keyword_match: dict, relevance: dict) -> dict:
+    """Deterministic stand-in for the LLM analysis of a resume that plainly doesn't fit."""
+    threshold = Config.RELEVANCE_THRESHOLD
+    exp_score = round(SKIPPED_EXPERIENCE_CAP * min(1.0, relevance["score"] / threshold))
+    
+    education_text = doc.sections.get("education") or doc.lower
+    degree = next((name for name, pattern in DEGREE_PATTERNS if pattern.search(education_text.lower())), None)
+    # "Bachelor's or Master's" asks for a Bachelor's: the lowest degree named
+    jd_lower = jd_text.lower()
+    required = next((name for name, pattern in reversed(DEGREE_PATTERNS) if pattern.search(jd_lower)), None)
+    if required is None:
+        edu_score = 60 if degree else 40
+    elif degree and DEGREE_RANK[degree] >= DEGREE_RANK[required]:
+        edu_score = 70
+    else:
+        edu_score = 40 if degree else 15
+    
+    missing = keyword_match["hard_skills"]["missing"]
+    found = keyword_match["hard_skills"]["found"] + keyword_match["soft_skills"]["found"]
+    return {
+        "experience_relevance_score": exp_score,
+        "experience_analysis": (
+            f"Estimated without a detailed AI review: the resume shares little wording with this job "
+            f"description (relevance {relevance['score']:.2f}, threshold {threshold:.2f})."
+        ),
+        "education_score": edu_score,
+        "education_analysis": f"Highest degree found: {degree or 'none'}; the job asks for: {required or 'no specific degree'}.",
+        "overall_fit": "Likely a poor fit — this resume and job description have little in common.",
+        "top_suggestions": [f"Show hands-on experience with {s}" for s in missing[:4]]
+        + ["Use the job description's wording where it truthfully matches your experience"],
+        "strengths": [f"Mentions {s}" for s in found[:5]],
+        "weaknesses": [f"No mention of {s}" for s in missing[:5]] or ["Little overlap with the job description's vocabulary"],
+    }
+
+
+async def full_analysis_async(resume_text: str, jd_text: str, filename: str) -> dict:
+    """Run complete analysis, with the LLM call overlapping the local checks.
+
+    Resumes scoring below RELEVANCE_THRESHOLD against the JD skip the LLM
+    and get estimated experience/education scores instead.
+    """
+    relevance = None
+    if Config.RELEVANCE_THRESHOLD > 0:
+        relevance = await asyncio.to_thread(score_relevance, resume_text, jd_text)
+    skipped = relevance is not None and relevance["score"] < Config.RELEVANCE_THRESHOLD
+    metrics.incr("analysis.llm_skipped" if skipped else "analysis.llm_called")
+    
+    if skipped:
+        jd_keywords, keyword_match, ats_check = await asyncio.to_thread(_local_checks, resume_text, jd_text, filename)
+        llm_analysis = _estimated_analysis(as_document(resume_text), jd_text, keyword_match, relevance)
+    else:
+        (jd_keywords, keyword_match, ats_check), llm_analysis = await asyncio.gather(
+            asyncio.to_thread(_local_checks, resume_text, jd_text, filename),
+            analyze_with_llm_async(resume_text, jd_text),
+        )
+    result = _combine(jd_keywords, keyword_match, ats_check, llm_analysis)
+    result["relevance"] = relevance
+    result["llm_skipped"] = skipped
+    return result
+
+
+def llm_skip_rate() -> float:
+    """Share of analyses in this process that were answered without the LLM."""
+    counts = metrics.counters("analysis.llm_")
+    skipped, called = counts.get("analysis.llm_skipped", 0), counts.get("analysis.llm_called", 0)
+    return skipped / (skipped + called) if skipped + called else 0.0
+
+
+def full_analysis(resume_text: str, jd_text: str, filename: str) -> dict:
+    """Run complete analysis: keywords + ATS + LLM deep analysis."""
+    return run_sync(full_analysis_async(resume_text, jd_text, filename))
+
+
+def rank_resumes(jd_text: str, resumes: list, llm_top_k: int = 0) -> list:
+    """Score many resumes against one JD and return a best-first leaderboard.
+
+    `resumes` is a list of dicts with "text", "filename" and an optional "id".
+    Keyword and ATS scores are computed for the whole batch at once, without
+    going through parse_cache; the LLM deep analysis only runs for the
+    `llm_top_k` best rows, concurrently.
+    """
+    jd_keywords = extract_keywords_from_jd(jd_text)
+    hard, soft = jd_keywords["hard_skills"], jd_keywords["soft_skills"]
+    matcher = _matcher_for(hard, soft)
+    n = len(resumes)
+    
+    # 1. Resume x skill presence matrix + ATS feature columns
+    skills = hard + soft
+    column = {s: j for j, s in enumerate(skills)}
+    presence = np.zeros((n, len(skills)), dtype=bool)
+    ats = np.zeros((n, 7), dtype=np.int64)
+    ats_features = []
+    for i, resume in enumerate(resumes):
+        doc = ResumeDocument(resume["text"], cached=False)
+        for skill in matcher.find(doc.lower, lowered=True):
+            if skill in column:
+                presence[i, column[skill]] = True
+        f = _ats_features(doc, resume.get("filename", ""))
+        ats[i] = (f["file_type_ok"], f["word_count"], bool(f["contact"]["email"]), bool(f["contact"]["phone"]),
+                  len(f["missing_sections"]), len(f["action_verbs"]), f["has_metrics"])
+        ats_features.append(f)
+    
+    # 2. Batch scores
+    hard_scores = np.round(presence[:, :len(hard)].mean(axis=1) * 100) if hard else np.zeros(n)
+    soft_scores = np.round(presence[:, len(hard):].mean(axis=1) * 100) if soft else np.zeros(n)
+    ats_scores = _ats_score(*ats.T)
+    exp_scores = np.full(n, 50.0)
+    edu_scores = np.full(n, 50.0)
+    overall = np.round(_overall_score(hard_scores, exp_scores, edu_scores, ats_scores, soft_scores))
+    order = np.argsort(-overall, kind="stable")
+    
+    # 3. Optional LLM deep analysis for the top rows only
+    llm_results = {}
+    top = order[:llm_top_k]
+    if len(top):
+        async def analyze_top():
+            return await asyncio.gather(*(analyze_with_llm_async(resumes[i]["text"], jd_text) for i in top))
+        
+        for i, analysis in zip(top, run_sync(analyze_top())):
+            llm_results[i] = analysis
+            exp_scores[i] = analysis.get("experience_relevance_score", 50)
+            edu_scores[i] = analysis.get("education_score", 50)
+    if llm_results:
+        overall = np.round(_overall_score(hard_scores, exp_scores, edu_scores, ats_scores, soft_scores))
+        order = np.argsort(-overall, kind="stable")
+    
+    leaderboard = []
+    for rank, i in enumerate(order, 1):
+        row = presence[i]
+        leaderboard.append({
+            "rank": rank,
+            "id": resumes[i].get("id", int(i)),
+            "filename": resumes[i].get("filename", ""),
+            "overall_score": int(overall[i]),
+            "hard_skills": {
+                "found": [s for j, s in enumerate(hard) if row[j]],
+                "missing": [s for j, s in enumerate(hard) if not row[j]],
+                "score": int(hard_scores[i]),
+            },
+            "soft_skills": {
+                "found": [s for j, s in enumerate(soft) if row[len(hard) + j]],
+                "missing": [s for j, s in enumerate(soft) if not row[len(hard) + j]],
+                "score": int(soft_scores[i]),
+            },
+            "ats_score": int(ats_scores[i]),
+            "experience_score": int(exp_scores[i]),
+            "education_score": int(edu_scores[i]),
+            "contact": ats_features[i]["contact"],
+            "llm_analysis": llm_results.get(i),
+        })
+    
+    return leaderboard
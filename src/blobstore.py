@@ -0,0 +1,197 @@
+"""Blob store — large session texts held once per process, keyed by content hash."""
+
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+from src.config import Config
+from src.parser import content_hash
+
+
+class BlobRef:
+    """Small handle to a stored text; keep this in session state instead of the text.
+
+    While any session holds a ref the text stays in memory. Refs for the
+    same content are shared, so a popular JD costs one copy however many
+    sessions paste it.
+    """
+
+    __slots__ = ("_store", "key", "size", "__weakref__")
+
+    def __init__(self, store, key: str, size: int):
+        self._store = store
+        self.key = key
+        self.size = size
+
+    @property
+    def text(self) -> str:
+        return self._store.get(self.key)
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return f"BlobRef({self.key[:12]}, {self.size} bytes)"
+
+
+class BlobStore:
+    """Deduplicating text store with reference counting and an LRU pool.
+
+    Texts are live while some BlobRef to them exists; Python's own
+    refcounting decides that, via weakref.finalize. Unreferenced texts move
+    to an LRU pool (bounded by `max_pooled_bytes`) so a re-upload of the
+    same resume can revive them without another copy.
+    """
+
+    def __init__(self, max_pooled_bytes: int = 64 * 2**20):
+        self.max_pooled_bytes = max_pooled_bytes
+        self._refs = weakref.WeakValueDictionary()
+        self._texts = {}
+        self._pool = OrderedDict()
+        self._pooled_bytes = 0
+        # Reentrant: a finalizer can fire while this thread holds the lock
+        self._lock = threading.RLock()
+        self._stats = {"puts": 0, "dedup_hits": 0, "revived": 0, "evictions": 0, "bytes_saved": 0}
+
+    def put(self, text: str) -> BlobRef:
+        """Store `text` (or find the existing copy) and return a ref to it."""
+        key = content_hash(text)
+        with self._lock:
+            self._stats["puts"] += 1
+            ref = self._refs.get(key)
+            if ref is not None:
+                self._stats["dedup_hits"] += 1
+                self._stats["bytes_saved"] += ref.size
+                return ref
+            pooled = self._pool.pop(key, None)
+            if pooled is not None:
+                text = pooled
+                self._pooled_bytes -= sys.getsizeof(text)
+                self._stats["revived"] += 1
+            self._texts[key] = text
+            ref = BlobRef(self, key, sys.getsizeof(text))
+            self._refs[key] = ref
+        weakref.finalize(ref, self._release, key)
+        return ref
+
+    def intern(self, text: str, key: str = None) -> str:
+        """The stored copy of `text` if there is one, else `text` itself.
+
+        Caches that keep texts sessions also store (parsed uploads, resume
+        documents) hold this copy, so each distinct text is in memory once.
+        """
+        key = key or content_hash(text)
+        with self._lock:
+            stored = self._texts.get(key)
+            if stored is None:
+                stored = self._pool.get(key)
+        return text if stored is None else stored
+
+    def texts(self) -> list:
+        """Snapshot of every live and pooled text (for memory accounting)."""
+        with self._lock:
+            return list(self._texts.values()) + list(self._pool.values())
+
+    def get(self, key: str, default: str = "") -> str:
+        with self._lock:
+            text = self._texts.get(key)
+            if text is None:
+                text = self._pool.get(key, default)
+            return text
+
+    def _release(self, key: str):
+        """Last ref to `key` is gone: move its text to the LRU pool."""
+        with self._lock:
+            if self._refs.get(key) is not None:
+                return
+            text = self._texts.pop(key, None)
+            if text is None:
+                return
+            self._pool[key] = text
+            self._pooled_bytes += sys.getsizeof(text)
+            while self._pooled_bytes > self.max_pooled_bytes and self._pool:
+                _, old = self._pool.popitem(last=False)
+                self._pooled_bytes -= sys.getsizeof(old)
+                self._stats["evictions"] += 1
+
+    def stats(self) -> dict:
+        """Counters plus live/pooled sizes."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["live_blobs"] = len(self._texts)
+            stats["live_bytes"] = sum(sys.getsizeof(t) for t in self._texts.values())
+            stats["pooled_blobs"] = len(self._pool)
+            stats["pooled_bytes"] = self._pooled_bytes
+        return stats
+
+
+# Process-wide store for session texts
+blob_store = BlobStore(max_pooled_bytes=Config.BLOB_POOL_MB * 2**20)
+
+
+def store_text(text: str) -> BlobRef:
+    """Put a text in the shared store; keep the returned ref in session state."""
+    return blob_store.put(text)
+
+
+def resolve(value) -> str:
+    """Text behind a BlobRef; plain strings (and None, as "") pass through."""
+    if isinstance(value, BlobRef):
+        return value.text
+    return value if value is not None else ""
+
+
+def deep_sizeof(obj, seen: set) -> int:
+    """Bytes held by `obj` and the strings and containers inside it.
+
+    Objects whose id is in `seen` are skipped and every object counted is
+    added to it, so sharing one `seen` across calls counts each once.
+    """
+    total = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+    return total
+
+
+def session_memory(state) -> dict:
+    """Approximate memory held by one session's state.
+
+    `own_bytes` is what only this session pays for; `shared_bytes` is the
+    size of the deduplicated texts it references (counted once each).
+    """
+    own = 0
+    shared = {}
+    seen = set()
+    stack = [state]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, BlobRef):
+            own += sys.getsizeof(obj)
+            shared[obj.key] = obj.size
+            continue
+        own += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, "items") and not isinstance(obj, (str, bytes)):
+            # SessionState and similar mappings
+            for key, value in obj.items():
+                stack.append(key)
+                stack.append(value)
+    return {"own_bytes": own, "shared_bytes": sum(shared.values()), "blobs": len(shared)}
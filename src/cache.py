@@ -0,0 +1,155 @@
+"""Tiered cache — bounded in-memory LRU in front of an optional on-disk store."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+
+def make_key(*parts) -> str:
+    """Content-addressed key: SHA-256 of the JSON-encoded parts."""
+    blob = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class TieredCache:
+    """LRU memory tier + JSON-file disk tier with TTL and a size cap.
+
+    Values must be JSON-serializable. Memory hits return in microseconds,
+    disk hits in about a millisecond; a disk hit is promoted back into
+    memory. Pass `directory=None` to keep everything in memory.
+    """
+
+    def __init__(self, maxsize: int = 256, directory: str = None, ttl: float = 7 * 86400, max_bytes: int = 100 * 2**20):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.directory = Path(directory) if directory else None
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = 0
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._disk_bytes = sum(f.stat().st_size for f in self.directory.glob("*.json"))
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str, default=None):
+        """Look up a key in memory, then on disk."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > now:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+
+        if self.directory:
+            path = self._path(key)
+            try:
+                stat = path.stat()
+                if stat.st_mtime + self.ttl > now:
+                    value = json.loads(path.read_text(encoding="utf-8"))
+                    with self._lock:
+                        self._stats["disk_hits"] += 1
+                        self._remember(key, value, stat.st_mtime + self.ttl)
+                    return value
+                self._unlink(path)
+            except (OSError, ValueError):
+                pass
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return default
+
+    def set(self, key: str, value):
+        """Store a value in both tiers."""
+        with self._lock:
+            self._remember(key, value, time.time() + self.ttl)
+        if not self.directory:
+            return
+        path = self._path(key)
+        data = json.dumps(value, ensure_ascii=False)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            tmp_path.write_text(data, encoding="utf-8")
+            old_size = path.stat().st_size if path.exists() else 0
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        with self._lock:
+            self._disk_bytes += len(data.encode()) - old_size
+            over = self._disk_bytes > self.max_bytes
+        if over:
+            self._trim_disk()
+
+    def discard(self, key: str):
+        """Remove a key from both tiers."""
+        with self._lock:
+            self._memory.pop(key, None)
+        if self.directory:
+            self._unlink(self._path(key))
+
+    def clear(self):
+        """Empty both tiers."""
+        with self._lock:
+            self._memory.clear()
+        if self.directory:
+            for path in self.directory.glob("*.json"):
+                self._unlink(path)
+
+    def memory_values(self) -> list:
+        """Snapshot of the values held in the memory tier (for memory accounting)."""
+        with self._lock:
+            return [value for _, value in self._memory.values()]
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current sizes."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._memory)
+            stats["disk_bytes"] = self._disk_bytes
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 3) if lookups else 0.0
+        return stats
+
+    def _remember(self, key: str, value, expires: float):
+        """Insert into the memory tier. Caller holds the lock."""
+        self._memory[key] = (expires, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _unlink(self, path: Path):
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return
+        with self._lock:
+            self._disk_bytes -= size
+
+    def _trim_disk(self):
+        """Drop expired files, then the oldest ones, until under the size cap."""
+        files = []
+        for path in self.directory.glob("*.json"):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        files.sort()
+        cutoff = time.time() - self.ttl
+        target = self.max_bytes * 0.9
+        for mtime, path in files:
+            if mtime > cutoff and self._disk_bytes <= target:
+                break
+            self._unlink(path)
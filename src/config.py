@@ -12,3 +12,74 @@ class Config:
     LLM_MODEL = os.getenv("LLM_MODEL", "mistral-large-3:675b")
     APP_USER = os.getenv("APP_USER", "admin")
     APP_PASS = os.getenv("APP_PASS", "resume123")
+
+    # LLM connection pool
+    LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "20"))
+    LLM_KEEPALIVE = float(os.getenv("LLM_KEEPALIVE", "60"))
+    LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+    LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "10"))
+
+    # Shared provider limits (0 = no limit) and retries for 429s / timeouts / 5xx
+    LLM_RPM = float(os.getenv("LLM_RPM", "60"))
+    LLM_TPM = float(os.getenv("LLM_TPM", "100000"))
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    LLM_MIN_CONCURRENCY = int(os.getenv("LLM_MIN_CONCURRENCY", "1"))
+    LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+    LLM_RETRY_BACKOFF = float(os.getenv("LLM_RETRY_BACKOFF", "1"))
+    LLM_RETRY_MAX_BACKOFF = float(os.getenv("LLM_RETRY_MAX_BACKOFF", "30"))
+    LLM_COMPLETION_ESTIMATE = int(os.getenv("LLM_COMPLETION_ESTIMATE", "800"))
+
+    # Prompt size, in tokens
+    LLM_PROMPT_BUDGET = int(os.getenv("LLM_PROMPT_BUDGET", "3000"))
+
+    # Structured output: provider JSON mode + targeted follow-ups for bad fields
+    LLM_JSON_MODE = os.getenv("LLM_JSON_MODE", "true").lower() in ("1", "true", "yes")
+    LLM_REPAIR_ATTEMPTS = int(os.getenv("LLM_REPAIR_ATTEMPTS", "1"))
+
+    # Resumes less similar than this to the JD (term cosine, 0-1) skip the LLM; 0 = never skip
+    RELEVANCE_THRESHOLD = float(os.getenv("RELEVANCE_THRESHOLD", "0.1"))
+
+    # LLM response cache
+    LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "256"))
+    LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", "data/llm_cache")
+    LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(7 * 86400)))
+    LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", "100"))
+
+    # Parallel "Rewrite All"
+    REWRITE_CONCURRENCY = int(os.getenv("REWRITE_CONCURRENCY", "3"))
+
+    # PDF parsing: page-parallel extraction for long documents
+    PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "8"))
+
+    # Parse cache (text, sections, contact info by content hash); empty dir = memory only
+    PARSE_CACHE_SIZE = int(os.getenv("PARSE_CACHE_SIZE", "512"))
+    PARSE_CACHE_DIR = os.getenv("PARSE_CACHE_DIR", "")
+    PARSE_CACHE_TTL = int(os.getenv("PARSE_CACHE_TTL", str(30 * 86400)))
+    PARSE_CACHE_MAX_MB = int(os.getenv("PARSE_CACHE_MAX_MB", "200"))
+
+    # Upload parsing in isolated worker processes
+    PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", "2"))
+    PARSE_TIMEOUT = float(os.getenv("PARSE_TIMEOUT", "30"))
+    PARSE_MAX_RSS_MB = int(os.getenv("PARSE_MAX_RSS_MB", "512"))
+    PARSE_MAX_PAGES = int(os.getenv("PARSE_MAX_PAGES", "50"))
+    PARSE_MAX_UPLOAD_MB = float(os.getenv("PARSE_MAX_UPLOAD_MB", "10"))
+    PARSE_WORKER_MAX_JOBS = int(os.getenv("PARSE_WORKER_MAX_JOBS", "200"))
+
+    # Shared session text store: MB of unreferenced texts kept for reuse
+    BLOB_POOL_MB = int(os.getenv("BLOB_POOL_MB", "64"))
+
+    # Skill taxonomy file, re-read when it changes
+    TAXONOMY_PATH = os.getenv("TAXONOMY_PATH", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "taxonomy.json"))
+    TAXONOMY_CHECK_INTERVAL = float(os.getenv("TAXONOMY_CHECK_INTERVAL", "5"))
+
+    # Background analysis jobs
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+    JOB_MAX_PENDING = int(os.getenv("JOB_MAX_PENDING", "100"))
+    JOB_RETENTION = float(os.getenv("JOB_RETENTION", "3600"))
+    JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1"))
+
+    # Bulk ingestion CLI (python -m src.ingest)
+    INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", str(os.cpu_count() or 1)))
+    # Seconds one file may take to decode before it is recorded as an error
+    INGEST_TIMEOUT = float(os.getenv("INGEST_TIMEOUT", "30"))
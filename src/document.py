@@ -0,0 +1,155 @@
+"""Resume document — one parsed view of a resume shared by every analyzer."""
+
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from functools import cached_property
+
+from src.blobstore import BlobRef, blob_store, deep_sizeof
+from src.parser import _find_contact_info, _split_sections, content_hash, extract_contact_info, extract_sections, parse_cache
+from src.taxonomy import Taxonomy, get_taxonomy
+
+METRIC_PATTERN = re.compile(r'\d+%|\$\d+|\d+\+')
+# Recently used documents kept with their computed views
+DOCUMENT_CACHE_SIZE = 32
+
+
+class ResumeDocument:
+    """Resume text plus everything the analyzers derive from it.
+
+    Each view (lowercased text, tokens, lines, sections, contact info,
+    metrics, action verbs) is computed on first access and then kept, so a
+    resume is scanned a fixed number of times however many checks read it.
+    Treat the views as read-only; copy before mutating. Action verbs come
+    from the taxonomy current when the document was created. With
+    `cached=False`, sections and contact info bypass parse_cache (for batch
+    work that would otherwise evict interactive users' entries).
+    """
+
+    def __init__(self, text: str, taxonomy: Taxonomy = None, cached: bool = True):
+        self.text = text
+        self.taxonomy = taxonomy or get_taxonomy()
+        self.cached = cached
+
+    def __len__(self):
+        return len(self.text)
+
+    @cached_property
+    def lower(self) -> str:
+        """Lowercased text, the form every case-insensitive check runs on."""
+        return self.text.lower()
+
+    @cached_property
+    def tokens(self) -> list:
+        """Whitespace-separated tokens of the original text."""
+        return self.text.split()
+
+    @cached_property
+    def token_set(self) -> frozenset:
+        """Distinct lowercased tokens, for O(1) whole-word lookups."""
+        return frozenset(self.lower.split())
+
+    @property
+    def word_count(self) -> int:
+        return len(self.tokens)
+
+    @cached_property
+    def line_offsets(self) -> array:
+        """Start offset of every line, as in `text.split('\\n')`."""
+        offsets = array("i", [0])
+        offsets.extend(m.end() for m in re.finditer("\n", self.text))
+        return offsets
+
+    def line(self, i: int) -> str:
+        """The i-th line, without its newline."""
+        start = self.line_offsets[i]
+        end = self.line_offsets[i + 1] - 1 if i + 1 < len(self.line_offsets) else len(self.text)
+        return self.text[start:end]
+
+    @cached_property
+    def sections(self) -> dict:
+        return extract_sections(self.text) if self.cached else _split_sections(self.text)
+
+    @cached_property
+    def contact(self) -> dict:
+        return extract_contact_info(self.text) if self.cached else _find_contact_info(self.text)
+
+    @cached_property
+    def metrics(self) -> list:
+        """Quantified achievements: "35%", "$2000", "10+"."""
+        return METRIC_PATTERN.findall(self.text)
+
+    @cached_property
+    def action_verbs(self) -> list:
+        """Taxonomy action verbs that appear in the text, in taxonomy order."""
+        if self.taxonomy.verb_pattern is None:
+            return []
+        seen = {m.group(1) for m in self.taxonomy.verb_pattern.finditer(self.lower)}
+        return [v for v in self.taxonomy.action_verbs if v in seen]
+
+
+_documents = OrderedDict()
+_documents_lock = threading.Lock()
+
+
+def get_document(text) -> ResumeDocument:
+    """Shared document for a resume text or BlobRef, so reruns reuse earlier scans.
+
+    Documents are cached by content hash and hold the blob store's copy of
+    the text, so a resume in session state is not kept twice.
+    """
+    if isinstance(text, BlobRef):
+        key, text = text.key, text.text
+    else:
+        key = content_hash(text)
+    # Keyed on the taxonomy too, so a reload is picked up by new lookups
+    key = (key, get_taxonomy())
+    with _documents_lock:
+        doc = _documents.get(key)
+        if doc is not None:
+            _documents.move_to_end(key)
+            return doc
+    doc = ResumeDocument(blob_store.intern(text, key[0]), key[1])
+    with _documents_lock:
+        doc = _documents.setdefault(key, doc)
+        _documents.move_to_end(key)
+        while len(_documents) > DOCUMENT_CACHE_SIZE:
+            _documents.popitem(last=False)
+    return doc
+
+
+def clear_documents():
+    """Drop every cached document."""
+    with _documents_lock:
+        _documents.clear()
+
+
+def memory_footprint() -> dict:
+    """Bytes held process-wide by shared texts and the caches built from them.
+
+    Each object is counted once, where it is first found: in the blob
+    store, then parse_cache's memory tier, then cached documents (their
+    text and computed views). So a cache that shares the stored copy of a
+    text adds nothing for it.
+    """
+    seen = set()
+    blobs = sum(deep_sizeof(text, seen) for text in blob_store.texts())
+    parsed = sum(deep_sizeof(value, seen) for value in parse_cache.memory_values())
+    with _documents_lock:
+        docs = list(_documents.values())
+    documents = sum(
+        deep_sizeof(value, seen) for doc in docs for name, value in vars(doc).items() if name != "taxonomy"
+    )
+    return {
+        "blob_bytes": blobs,
+        "parse_cache_bytes": parsed,
+        "document_bytes": documents,
+        "documents": len(docs),
+        "total_bytes": blobs + parsed + documents,
+    }
+
+
+def as_document(resume) -> ResumeDocument:
+    """Accept either a ResumeDocument or raw resume text."""
+    return resume if isinstance(resume, ResumeDocument) else get_document(resume)
@@ -0,0 +1,336 @@
+"""Resume index — skill posting lists for fast top-k candidate retrieval."""
+
+import json
+import os
+import threading
+from array import array
+
+import numpy as np
+
+from src.parser import extract_resume_text, extract_sections, get_skill_matcher
+
+# Skills used in these sections count as applied, not just listed
+APPLIED_SECTIONS = ("experience", "projects")
+APPLIED_BONUS = 0.25
+HARD_WEIGHT = 0.35
+SOFT_WEIGHT = 0.10
+# Compact once this share of documents are tombstones
+COMPACT_RATIO = 0.25
+# Skills in more than 1/DENSE_FRACTION of resumes are also kept as bitmaps
+DENSE_FRACTION = 32
+
+
+_BYTE_POPCOUNT = np.array([bin(b).count("1") for b in range(256)], dtype=np.uint8)
+
+
+def _popcount(words: np.ndarray) -> int:
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(words).sum())
+    return int(_BYTE_POPCOUNT[words.view(np.uint8)].sum())
+
+
+def _increment(planes: list, bits: np.ndarray, limit: int):
+    """Add 1 to every resume set in `bits`, on counts stored as bit planes (lowest first).
+
+    `limit` is the largest count possible after the add, so the carry
+    never needs to ripple past its bit length.
+    """
+    for i in range(limit.bit_length()):
+        if i == len(planes):
+            planes.append(bits)
+            return
+        planes[i], bits = planes[i] ^ bits, planes[i] & bits
+
+
+def _levels(planes: list, live: np.ndarray, limit: int) -> list:
+    """Bitmaps of the live resumes whose count is 0, 1, ... `limit`."""
+    levels = [live]
+    for plane in planes:
+        levels = ([m & ~plane for m in levels] + [m & plane for m in levels])[:limit + 1]
+    return levels
+
+
+def _members(words: np.ndarray) -> np.ndarray:
+    """Sorted doc numbers set in a bitmap."""
+    nonzero = np.flatnonzero(words)
+    rows, cols = np.nonzero(np.unpackbits(words.view(np.uint8).reshape(-1, 8)[nonzero], axis=1))
+    return nonzero[rows] * 64 + cols
+
+
+def _values(planes: list, docs: np.ndarray) -> np.ndarray:
+    """Counts stored as bit planes, read out for some doc numbers."""
+    values = np.zeros(len(docs), dtype=np.uint16)
+    for i, plane in enumerate(planes):
+        bits = (plane.view(np.uint8)[docs >> 3] >> (7 - (docs & 7)).astype(np.uint8)) & 1
+        values |= bits.astype(np.uint16) << i
+    return values
+
+
+class ResumeIndex:
+    """Inverted index from skill to the resumes that mention it.
+
+    Documents get dense internal numbers; each skill keeps an append-only
+    posting array of those numbers, so adding a resume never rebuilds
+    anything. Deletes leave a tombstone that queries mask out, and the
+    postings are compacted once enough of them pile up.
+
+    Popular skills are also kept as packed bitmaps, cached and kept
+    current on add, so checking whether a candidate lists one is a bit
+    lookup. Queries only ever touch candidate resumes, never the whole
+    corpus. The index is shared between sessions, so every read and
+    write takes its lock.
+    """
+
+    def __init__(self):
+        self._ids = []
+        self._doc_of = {}
+        self._live = bytearray()
+        self._postings = {}
+        self._applied = {}
+        self._arrays = {}
+        self._deleted = 0
+        self._live_bits = None
+        # Shared across sessions: queries fill the view cache, adds and deletes mutate
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._doc_of)
+
+    def __contains__(self, resume_id):
+        return resume_id in self._doc_of
+
+    # --- Building ---
+
+    def add(self, resume_id, text: str, sections: dict = None):
+        """Index a resume from its text (and sections, if already parsed)."""
+        matcher = get_skill_matcher()
+        if sections is None:
+            sections = extract_sections(text)
+        skills = matcher.find(text)
+        applied = set()
+        for name in APPLIED_SECTIONS:
+            if sections.get(name):
+                applied |= matcher.find(sections[name])
+        self.add_skills(resume_id, skills, applied & skills)
+
+    def add_file(self, resume_id, file_bytes: bytes, filename: str):
+        """Parse an uploaded resume file and index it."""
+        self.add(resume_id, extract_resume_text(file_bytes, filename))
+
+    def add_skills(self, resume_id, skills, applied=()):
+        """Index a resume from precomputed skill sets, replacing any earlier version."""
+        with self._lock:
+            if resume_id in self._doc_of:
+                self.delete(resume_id)
+            doc = len(self._ids)
+            self._ids.append(resume_id)
+            self._doc_of[resume_id] = doc
+            self._live.append(1)
+            self._live_bits = None
+            for skill in skills:
+                self._postings.setdefault(skill, array("i")).append(doc)
+                self._touch(skill, doc)
+            for skill in applied:
+                self._applied.setdefault(skill, array("i")).append(doc)
+                self._touch(("applied", skill), doc)
+
+    def _touch(self, key, doc: int):
+        """Keep the cached query view of a posting list current."""
+        view = self._arrays.get(key)
+        if view is None or view.dtype != np.uint8:
+            self._arrays.pop(key, None)
+            return
+        if doc >> 3 >= len(view):
+            view = np.concatenate([view, np.zeros(max(len(view), 8), dtype=np.uint8)])
+            self._arrays[key] = view
+        view[doc >> 3] |= 0x80 >> (doc & 7)
+
+    def delete(self, resume_id) -> bool:
+        """Remove a resume. Returns False if it was not indexed."""
+        with self._lock:
+            doc = self._doc_of.pop(resume_id, None)
+            if doc is None:
+                return False
+            self._live[doc] = 0
+            self._live_bits = None
+            self._deleted += 1
+            if self._deleted > COMPACT_RATIO * len(self._ids):
+                self.compact()
+            return True
+
+    def compact(self):
+        """Drop tombstones and renumber documents densely."""
+        with self._lock:
+            live = np.frombuffer(bytes(self._live), dtype=np.uint8).astype(bool)
+            remap = np.cumsum(live, dtype=np.int64) - 1
+
+            def rebuild(postings):
+                out = {}
+                for skill, docs in postings.items():
+                    docs = np.frombuffer(docs, dtype=np.int32)
+                    docs = remap[docs[live[docs]]].astype(np.int32)
+                    if len(docs):
+                        out[skill] = array("i", docs.tobytes())
+                return out
+
+            self._postings = rebuild(self._postings)
+            self._applied = rebuild(self._applied)
+            self._ids = [rid for rid, ok in zip(self._ids, live) if ok]
+            self._doc_of = {rid: doc for doc, rid in enumerate(self._ids)}
+            self._live = bytearray(b"\x01" * len(self._ids))
+            self._arrays = {}
+            self._live_bits = None
+            self._deleted = 0
+
+    # --- Querying ---
+
+    def _view(self, key):
+        """Cached query view: a packed bitmap for popular skills, else a posting array."""
+        view = self._arrays.get(key)
+        if view is None:
+            postings = self._applied if isinstance(key, tuple) else self._postings
+            docs = np.frombuffer(postings.get(key[1] if isinstance(key, tuple) else key, array("i")), dtype=np.int32)
+            if len(docs) * DENSE_FRACTION >= len(self._ids):
+                # Whole uint64 words, so search can use it without copying
+                mask = np.zeros(-(-len(self._ids) // 64) * 64, dtype=bool)
+                mask[docs] = True
+                view = np.packbits(mask)
+            else:
+                view = docs.copy()
+            self._arrays[key] = view
+        return view
+
+    def _words(self, key, size: int) -> np.ndarray:
+        """A posting list as a bitmap of `size` uint64 words, in np.packbits bit order."""
+        view = self._view(key)
+        if view.dtype == np.uint8 and len(view) >= size * 8:
+            return view[:size * 8].view(np.uint64)
+        bits = np.zeros(size * 8, dtype=np.uint8)
+        if view.dtype == np.uint8:
+            bits[:len(view)] = view
+        else:
+            # Postings are unique, so adding each resume's bit is the same as setting it
+            np.add.at(bits, view >> 3, (0x80 >> (view & 7)).astype(np.uint8))
+        return bits.view(np.uint64)
+
+    def _live_words(self, size: int) -> np.ndarray:
+        if self._live_bits is None or len(self._live_bits) != size:
+            live = np.zeros(size * 64, dtype=np.uint8)
+            live[:len(self._live)] = np.frombuffer(bytes(self._live), dtype=np.uint8)
+            self._live_bits = np.packbits(live).view(np.uint64)
+        return self._live_bits
+
+    def search(self, jd_keywords: dict, k: int = 10) -> list:
+        """Top-k resumes for JD keywords, as (resume_id, score 0-100) pairs.
+
+        The score is the weighted hard/soft skill overlap used by
+        `full_analysis`, with a small bonus for skills that show up in the
+        experience or projects sections.
+
+        Per-resume skill counts are summed as bit planes over packed
+        bitmaps (64 resumes per word op), which bounds every resume's
+        score from its listed-skill counts alone. Only resumes whose upper
+        bound reaches the k-th best lower bound are unpacked and scored.
+        """
+        hard, soft = jd_keywords.get("hard_skills", []), jd_keywords.get("soft_skills", [])
+        total = (HARD_WEIGHT if hard else 0) + (SOFT_WEIGHT if soft else 0)
+        if not total or k <= 0:
+            return []
+
+        listed_step = round(1 / APPLIED_BONUS)
+        with self._lock:
+            if not self._ids:
+                return []
+            size = -(-len(self._ids) // 64)
+            live = self._live_words(size)
+            # Per group: weight of one applied skill, then listed and applied counts as bit planes
+            groups = []
+            for skills, weight in ((hard, HARD_WEIGHT), (soft, SOFT_WEIGHT)):
+                listed, applied, matched = [], [], 0
+                for skill in skills:
+                    if skill not in self._postings:
+                        continue
+                    matched += 1
+                    _increment(listed, self._words(skill, size), matched)
+                    if skill in self._applied:
+                        _increment(applied, self._words(("applied", skill), size), matched)
+                groups.append((weight / max(len(skills), 1) / (listed_step + 1), listed, applied, matched))
+            (hard_unit, hard_listed, _, hard_matched), (soft_unit, soft_listed, _, soft_matched) = groups
+
+            # Resumes by (hard, soft) listed count; applied skills add at most one unit each
+            hard_levels = _levels(hard_listed, live, hard_matched)
+            soft_levels = _levels(soft_listed, live, soft_matched)
+            hard_sizes, soft_sizes = [_popcount(m) for m in hard_levels], [_popcount(m) for m in soft_levels]
+            combos = [
+                (listed_step * (hard_unit * x + soft_unit * y), (listed_step + 1) * (hard_unit * x + soft_unit * y), x, y)
+                for x in range(len(hard_levels)) if hard_sizes[x]
+                for y in range(len(soft_levels)) if soft_sizes[y] and (x or y)
+            ]
+            combos.sort(reverse=True)
+
+            # The k-th best score is at least the lower bound reached by k resumes
+            threshold, found, masks = 0.0, 0, {}
+            for low, _, x, y in combos:
+                masks[x, y] = hard_levels[x] & soft_levels[y]
+                found += _popcount(masks[x, y])
+                if found >= k:
+                    threshold = low
+                    break
+            candidates = np.zeros(size, dtype=np.uint64)
+            for _, high, x, y in combos:
+                if high >= threshold - 1e-9:
+                    candidates |= masks.get((x, y), hard_levels[x] & soft_levels[y])
+            candidates = _members(candidates)
+
+            scores = np.zeros(len(candidates), dtype=np.float32)
+            for unit, listed, applied, _ in groups:
+                if listed:
+                    counts = listed_step * _values(listed, candidates) + _values(applied, candidates)
+                    scores += counts * np.float32(unit)
+            k = min(k, len(candidates))
+            if not k:
+                return []
+            top = np.argpartition(scores, len(scores) - k)[len(scores) - k:]
+            top = top[np.lexsort((candidates[top], -scores[top]))]
+            return [(self._ids[candidates[i]], round(float(scores[i]) / total * 100, 1)) for i in top if scores[i] > 0]
+
+    # --- Persistence ---
+
+    def save(self, path: str):
+        """Write the index to a single .npz file (atomically)."""
+        with self._lock:
+            def pack(postings):
+                skills = sorted(postings)
+                lengths = [len(postings[s]) for s in skills]
+                docs = np.concatenate([np.frombuffer(postings[s], dtype=np.int32) for s in skills]) if skills else np.zeros(0, np.int32)
+                return json.dumps(skills), np.array(lengths, dtype=np.int64), docs
+
+            skills, lengths, docs = pack(self._postings)
+            a_skills, a_lengths, a_docs = pack(self._applied)
+            tmp_path = f"{path}.tmp.npz"
+            np.savez(
+                tmp_path,
+                ids=np.frombuffer(json.dumps(self._ids).encode(), dtype=np.uint8),
+                live=np.frombuffer(bytes(self._live), dtype=np.uint8),
+                skills=np.frombuffer(skills.encode(), dtype=np.uint8), lengths=lengths, docs=docs,
+                applied_skills=np.frombuffer(a_skills.encode(), dtype=np.uint8), applied_lengths=a_lengths, applied_docs=a_docs,
+            )
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "ResumeIndex":
+        """Read an index written by `save`."""
+        def unpack(skills, lengths, docs):
+            skills = json.loads(skills.tobytes().decode())
+            bounds = np.concatenate([[0], np.cumsum(lengths)])
+            return {s: array("i", docs[bounds[i]:bounds[i + 1]].tobytes()) for i, s in enumerate(skills)}
+
+        index = cls()
+        with np.load(path) as data:
+            index._ids = json.loads(data["ids"].tobytes().decode())
+            index._live = bytearray(data["live"].tobytes())
+            index._postings = unpack(data["skills"], data["lengths"], data["docs"])
+            index._applied = unpack(data["applied_skills"], data["applied_lengths"], data["applied_docs"])
+        index._doc_of = {rid: doc for doc, rid in enumerate(index._ids) if index._live[doc]}
+        index._deleted = len(index._ids) - len(index._doc_of)
+        return index
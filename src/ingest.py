@@ -0,0 +1,236 @@
+"""Bulk ingestion — parse folders and zip archives of resumes into JSONL.
+
+Run with `python -m src.ingest DUMP_DIR resumes.zip -o parsed.jsonl`.
+
+Each input file becomes one JSON line with its text, sections and contact
+info, or the error that stopped it. Files are decoded in sandboxed parse
+workers (src.sandbox), so one that hangs or eats memory is killed after
+INGEST_TIMEOUT seconds and recorded as an error instead of stalling the
+run. The output file doubles as the checkpoint: re-running the same
+command skips every file already in it, so an interrupted run picks up
+where it stopped.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from src.config import Config
+from src.parser import _find_contact_info, _split_sections
+from src.sandbox import ParsePool, check_upload_size
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".doc", ".txt", ".md")
+# Separates an archive path from the member name in a source id
+ZIP_SEPARATOR = "::"
+# Files queued per worker; bounds how many file bodies sit in memory at once
+INFLIGHT_PER_WORKER = 4
+
+
+def _supported(name: str) -> bool:
+    return os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS
+
+
+def iter_sources(paths) -> list:
+    """Source ids for every resume under `paths`, in a stable order.
+
+    Plain files are ids by path; members of zip archives (given directly or
+    found while walking a folder) are `archive.zip::member/name.pdf`.
+    """
+    sources = []
+
+    def add_file(path):
+        if path.lower().endswith(".zip"):
+            try:
+                with zipfile.ZipFile(path) as archive:
+                    members = sorted(
+                        info.filename for info in archive.infolist()
+                        if not info.is_dir() and _supported(info.filename)
+                    )
+            except (OSError, zipfile.BadZipFile) as e:
+                print(f"skipping {path}: {e}", file=sys.stderr)
+                return
+            sources.extend(f"{path}{ZIP_SEPARATOR}{member}" for member in members)
+        elif _supported(path):
+            sources.append(path)
+
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    add_file(os.path.join(root, name))
+        else:
+            add_file(path)
+    return sources
+
+
+def parse_source(source_id: str, file_bytes: bytes, parse_pool: ParsePool) -> dict:
+    """Parse one resume into an output record, decoding it in a sandboxed worker."""
+    ext = os.path.splitext(source_id.rsplit(ZIP_SEPARATOR, 1)[-1])[1].lower()
+    try:
+        check_upload_size(len(file_bytes))
+        text = parse_pool.parse(file_bytes, ext)
+        # Uncached: every file is seen once, and would only push interactive users out of parse_cache
+        return {
+            "id": source_id,
+            "status": "ok",
+            "text": text,
+            "sections": _split_sections(text),
+            "contact": _find_contact_info(text),
+        }
+    except Exception as e:
+        return _error(source_id, e)
+
+
+def _error(source_id: str, error) -> dict:
+    return {"id": source_id, "status": "error", "error": f"{type(error).__name__}: {error}"}
+
+
+def load_checkpoint(output: str, retry_errors: bool = False) -> set:
+    """Ids already recorded in `output`.
+
+    A line cut short by a crash is truncated away so appending stays valid
+    JSONL. With `retry_errors`, files that failed before are not counted as
+    done (the retry appends a new record; the last one for an id wins).
+    """
+    done = set()
+    if not os.path.exists(output):
+        return done
+    good_bytes = 0
+    with open(output, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            good_bytes += len(line)
+            if record.get("status") == "ok" or not retry_errors:
+                done.add(record["id"])
+            else:
+                done.discard(record["id"])
+    if good_bytes < os.path.getsize(output):
+        with open(output, "r+b") as f:
+            f.truncate(good_bytes)
+    return done
+
+
+class _Reader:
+    """Reads source bytes, keeping each zip archive open while it is in use."""
+
+    def __init__(self):
+        self._archives = {}
+
+    def read(self, source_id: str) -> bytes:
+        if ZIP_SEPARATOR not in source_id:
+            with open(source_id, "rb") as f:
+                return f.read()
+        path, member = source_id.split(ZIP_SEPARATOR, 1)
+        archive = self._archives.get(path)
+        if archive is None:
+            # Sources come grouped by archive, so one open at a time is enough
+            self.close()
+            archive = self._archives[path] = zipfile.ZipFile(path)
+        return archive.read(member)
+
+    def close(self):
+        for archive in self._archives.values():
+            archive.close()
+        self._archives = {}
+
+
+def ingest(paths, output: str, workers: int = None, retry_errors: bool = False, progress_every: float = 5.0,
+           timeout: float = None) -> dict:
+    """Parse every resume under `paths` into `output`, skipping ones already there.
+
+    A file that takes longer than `timeout` seconds to decode (or crashes
+    its worker, or hits the memory limit) is recorded as an error and its
+    worker replaced. Returns a summary with counts and files/second.
+    """
+    workers = workers or Config.INGEST_WORKERS
+    timeout = timeout or Config.INGEST_TIMEOUT
+    done = load_checkpoint(output, retry_errors)
+    sources = [s for s in iter_sources(paths) if s not in done]
+    summary = {"total": len(sources) + len(done), "skipped": len(done), "ok": 0, "errors": 0}
+    print(f"{len(sources)} files to parse, {len(done)} already in {output}", file=sys.stderr)
+
+    reader = _Reader()
+    parse_pool = ParsePool(size=workers, timeout=timeout)
+    # Threads only wait on the parse workers' pipes, plus the section/contact split
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest")
+    pending = {}
+    queue = iter(sources)
+    start = last_report = time.perf_counter()
+
+    with open(output, "a", encoding="utf-8") as out:
+        def write(record):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            summary["ok" if record["status"] == "ok" else "errors"] += 1
+
+        try:
+            while True:
+                # Keep the pool fed without reading the whole dump into memory
+                while len(pending) < workers * INFLIGHT_PER_WORKER:
+                    source_id = next(queue, None)
+                    if source_id is None:
+                        break
+                    try:
+                        file_bytes = reader.read(source_id)
+                    except (OSError, KeyError, zipfile.BadZipFile) as e:
+                        write(_error(source_id, e))
+                        continue
+                    pending[pool.submit(parse_source, source_id, file_bytes, parse_pool)] = source_id
+                if not pending:
+                    break
+
+                # parse_source never raises, and every parse is bounded by the worker timeout
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    pending.pop(future)
+                    write(future.result())
+
+                now = time.perf_counter()
+                if now - last_report >= progress_every:
+                    parsed = summary["ok"] + summary["errors"]
+                    print(
+                        f"{parsed}/{len(sources)} files, {parsed / (now - start):.1f} files/s, "
+                        f"{summary['errors']} errors",
+                        file=sys.stderr,
+                    )
+                    last_report = now
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            parse_pool.shutdown()
+            reader.close()
+
+    summary["seconds"] = round(time.perf_counter() - start, 2)
+    parsed = summary["ok"] + summary["errors"]
+    summary["files_per_sec"] = round(parsed / summary["seconds"], 1) if summary["seconds"] else 0.0
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.ingest", description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="resume files, folders or .zip archives")
+    parser.add_argument("-o", "--output", required=True, help="JSONL output (also the resume checkpoint)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help=f"worker processes (default {Config.INGEST_WORKERS})")
+    parser.add_argument("--timeout", type=float, default=None, help=f"seconds per file before it counts as an error (default {Config.INGEST_TIMEOUT:g})")
+    parser.add_argument("--retry-errors", action="store_true", help="re-parse files that failed in an earlier run")
+    args = parser.parse_args(argv)
+
+    summary = ingest(args.paths, args.output, workers=args.workers, retry_errors=args.retry_errors, timeout=args.timeout)
+    print(
+        f"done: {summary['ok']} ok, {summary['errors']} errors, {summary['skipped']} skipped "
+        f"in {summary['seconds']}s ({summary['files_per_sec']} files/s)",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
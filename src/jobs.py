@@ -0,0 +1,177 @@
+"""Background jobs — long analyses run off the Streamlit script thread.
+
+A page submits work and keeps only the job ID; a worker thread runs it
+and the page polls for progress. Jobs live in the process, not the
+session, so a reload or reconnect picks the result back up.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from src import metrics
+from src.config import Config
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class QueueFullError(Exception):
+    """Too many jobs waiting; the message can be shown to the user."""
+
+
+class Job:
+    """One unit of background work and its outcome.
+
+    `fn` is called as `fn(job, *args, **kwargs)` and may call
+    `job.progress(message)` to report what it is doing. Its return value
+    becomes `result`; an exception becomes `error` (its message).
+    """
+
+    def __init__(self, fn, args: tuple, kwargs: dict, owner: str = "", kind: str = "job"):
+        self.id = uuid.uuid4().hex
+        self.owner = owner
+        self.kind = kind
+        self.status = QUEUED
+        self.stage = "Waiting for a worker..."
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self._call = (fn, args, kwargs)
+        self._future = None
+
+    def progress(self, message: str):
+        self.stage = message
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINISHED
+
+    @property
+    def wait_seconds(self) -> float:
+        return (self.started or self.finished or time.time()) - self.submitted
+
+    @property
+    def run_seconds(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    def __repr__(self):
+        return f"Job({self.id[:8]}, {self.kind}, {self.status})"
+
+
+class JobQueue:
+    """Thread pool plus a registry of recent jobs, shared by all sessions.
+
+    At most `workers` jobs run at once; up to `max_pending` more wait in
+    order. Finished jobs are kept for `retention` seconds so a session
+    that reconnects can still read its result.
+    """
+
+    def __init__(self, workers: int = None, max_pending: int = None, retention: float = None):
+        self.workers = workers or Config.JOB_WORKERS
+        self.max_pending = max_pending or Config.JOB_MAX_PENDING
+        self.retention = retention if retention is not None else Config.JOB_RETENTION
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, owner: str = "", kind: str = "job", **kwargs) -> Job:
+        """Queue `fn` and return its Job. Raises QueueFullError when saturated."""
+        job = Job(fn, args, kwargs, owner, kind)
+        with self._lock:
+            self._prune()
+            if sum(j.status == QUEUED for j in self._jobs.values()) >= self.max_pending:
+                metrics.incr("jobs.rejected")
+                raise QueueFullError("The server is busy; please try again in a minute")
+            self._jobs[job.id] = job
+            job._future = self._executor.submit(self._run, job)
+        metrics.incr("jobs.submitted")
+        return job
+
+    def _run(self, job: Job):
+        with self._lock:
+            if job.status != QUEUED:
+                return
+            job.status = RUNNING
+            job.started = time.time()
+        job.stage = "Starting..."
+        fn, args, kwargs = job._call
+        status = FAILED
+        try:
+            job.result = fn(job, *args, **kwargs)
+            status = DONE
+        except Exception as e:
+            job.error = str(e) or type(e).__name__
+        finally:
+            # Status last, so pollers never see a finished job without its outcome
+            job.finished = time.time()
+            job._call = None
+            job.status = status
+        metrics.incr(f"jobs.{job.status}")
+        metrics.record("jobs.run", kind=job.kind, status=job.status,
+                       wait=round(job.wait_seconds, 3), run=round(job.run_seconds, 3))
+
+    def get(self, job_id: str) -> Job:
+        """The job with this ID, or None if unknown or expired."""
+        with self._lock:
+            self._prune()
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that has not started yet; running jobs finish."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != QUEUED:
+                return False
+            job.status = CANCELLED
+            job.finished = time.time()
+            job._future.cancel()
+        metrics.incr("jobs.cancelled")
+        return True
+
+    def stats(self) -> dict:
+        """Queue depth, jobs running, and mean wait/run time of recent jobs."""
+        recent = [e for e in metrics.events("jobs.run") if e["ts"] > time.time() - 3600]
+        with self._lock:
+            self._prune()
+            statuses = [j.status for j in self._jobs.values()]
+            waiting = [j.wait_seconds for j in self._jobs.values() if j.status == QUEUED]
+        return {
+            "queued": statuses.count(QUEUED),
+            "running": statuses.count(RUNNING),
+            "workers": self.workers,
+            "oldest_wait": max(waiting, default=0.0),
+            "finished_last_hour": len(recent),
+            "avg_wait": sum(e["wait"] for e in recent) / len(recent) if recent else 0.0,
+            "avg_run": sum(e["run"] for e in recent) / len(recent) if recent else 0.0,
+        }
+
+    def _prune(self):
+        # Caller holds the lock. Runs on every lookup, so finished results
+        # are released even when nothing new is submitted
+        cutoff = time.time() - self.retention
+        expired = [k for k, j in self._jobs.items() if j.done and j.finished < cutoff]
+        for key in expired:
+            del self._jobs[key]
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Process-wide job queue, started on first use."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+    return _queue
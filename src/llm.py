@@ -1,16 +1,364 @@
 """LLM factory — multi-provider support."""
 
 import os
+import time
+import asyncio
+import threading
+from concurrent.futures import CancelledError, Future
+import httpx
 from langchain_openai import ChatOpenAI
+from openai import BadRequestError
+from src import metrics
+from src.cache import TieredCache, make_key
+from src.config import Config
+from src.prompt import count_tokens
+from src.ratelimit import get_rate_limiter
+
+# Shared by every session in this process
+llm_cache = TieredCache(
+    maxsize=Config.LLM_CACHE_SIZE,
+    directory=Config.LLM_CACHE_DIR or None,
+    ttl=Config.LLM_CACHE_TTL,
+    max_bytes=Config.LLM_CACHE_MAX_MB * 2**20,
+)
+
+
+def _settings() -> dict:
+    """Provider settings from runtime env (the Settings page can change them)."""
+    return {
+        "model": os.getenv("LLM_MODEL", "mistral-large-3:675b"),
+        "base_url": os.getenv("LLM_BASE_URL", "https://ollama.com/v1"),
+        "api_key": os.getenv("LLM_API_KEY", "not-needed") or "not-needed",
+    }
+
+
+_clients = {}
+# (base_url, api_key) -> (httpx.Client, httpx.AsyncClient), shared by that provider's LLM clients
+_pools = {}
+_clients_lock = threading.Lock()
+
+
+def _http_clients(base_url: str, api_key: str) -> tuple:
+    """Keep-alive connection pools for one provider (sync + async); caller holds the lock."""
+    pools = _pools.get((base_url, api_key))
+    if pools is None:
+        limits = httpx.Limits(
+            max_connections=Config.LLM_POOL_SIZE,
+            max_keepalive_connections=Config.LLM_POOL_SIZE,
+            keepalive_expiry=Config.LLM_KEEPALIVE,
+        )
+        timeout = httpx.Timeout(Config.LLM_TIMEOUT, connect=Config.LLM_CONNECT_TIMEOUT)
+        pools = _pools[(base_url, api_key)] = (
+            httpx.Client(limits=limits, timeout=timeout),
+            httpx.AsyncClient(limits=limits, timeout=timeout),
+        )
+    return pools
+
+
+def _forget_pools(keep=None):
+    """Stop handing out every provider's pools except `keep`'s; caller holds the lock.
+
+    Nothing is closed here: calls already in flight (other sessions,
+    background jobs) hold their client and finish on it, and a pool's
+    connections are released once the last of them lets go.
+    """
+    for provider in [p for p in _pools if p != keep]:
+        del _pools[provider]
 
 
 def get_llm(temperature: float = 0.1, streaming: bool = False):
-    """Create LLM instance from runtime env."""
-    return ChatOpenAI(
-        model=os.getenv("LLM_MODEL", "mistral-large-3:675b"),
-        base_url=os.getenv("LLM_BASE_URL", "https://ollama.com/v1"),
-        api_key=os.getenv("LLM_API_KEY", "not-needed") or "not-needed",
-        temperature=temperature,
+    """Shared LLM client for the current runtime env.
+
+    Clients are reused per (model, base_url, api_key, temperature, streaming)
+    and all clients for one provider share its connection pools, so
+    connections and TLS sessions survive between calls. When the Settings
+    page points the env at another provider, clients and pools for the old
+    one are dropped on the next lookup (see `_forget_pools`).
+    """
+    settings = _settings()
+    key = (settings["model"], settings["base_url"], settings["api_key"], temperature, streaming)
+    with _clients_lock:
+        llm = _clients.get(key)
+        if llm is None:
+            for stale in [k for k in _clients if k[:3] != key[:3]]:
+                del _clients[stale]
+            _forget_pools(keep=key[1:3])
+            http_client, http_async_client = _http_clients(settings["base_url"], settings["api_key"])
+            llm = ChatOpenAI(
+                **settings,
+                temperature=temperature,
+                streaming=streaming,
+                request_timeout=Config.LLM_TIMEOUT,
+                # Retries go through the shared rate limiter instead
+                max_retries=0,
+                http_client=http_client,
+                http_async_client=http_async_client,
+            )
+            _clients[key] = llm
+    return llm
+
+
+def reset_llm_clients():
+    """Forget all pooled clients, so the next call builds fresh ones (e.g. after the provider settings change)."""
+    with _clients_lock:
+        _clients.clear()
+        _forget_pools()
+
+
+def cache_key(messages: list, temperature: float = 0.1) -> str:
+    """Cache key for a prompt: model, base URL, temperature and rendered messages."""
+    settings = _settings()
+    rendered = [(m.type, m.content) for m in messages]
+    return make_key(settings["model"], settings["base_url"], temperature, rendered)
+
+
+def _record_usage(messages: list, text: str, response=None, seconds: float = 0.0, streaming: bool = False):
+    """Record prompt/completion token counts for one provider call.
+
+    Uses the provider's reported usage when present, else counts locally.
+    """
+    usage = getattr(response, "usage_metadata", None) or {}
+    prompt_tokens = usage.get("input_tokens") or sum(count_tokens(m.content) for m in messages)
+    completion_tokens = usage.get("output_tokens") or count_tokens(text)
+    metrics.incr("llm.calls")
+    metrics.incr("llm.prompt_tokens", prompt_tokens)
+    metrics.incr("llm.completion_tokens", completion_tokens)
+    metrics.record(
+        "llm.call",
+        model=_settings()["model"],
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        seconds=round(seconds, 3),
         streaming=streaming,
-        request_timeout=120,
+        estimated=not usage,
     )
+
+
+def rate_limiter():
+    """Rate limiter shared by every call to the current provider."""
+    return get_rate_limiter(_settings()["base_url"])
+
+
+def _estimate_tokens(messages: list) -> int:
+    """Tokens to reserve for a call before its real usage is known."""
+    return sum(count_tokens(m.content) for m in messages) + Config.LLM_COMPLETION_ESTIMATE
+
+
+def _used_tokens(response):
+    usage = getattr(response, "usage_metadata", None) or {}
+    return usage.get("total_tokens")
+
+
+_json_mode_unsupported = set()
+
+
+def _runnable(temperature: float, json_mode: bool) -> tuple:
+    """Client for one call, bound to the provider's JSON response format when asked for."""
+    llm = get_llm(temperature)
+    provider = (_settings()["base_url"], _settings()["model"])
+    if json_mode and Config.LLM_JSON_MODE and provider not in _json_mode_unsupported:
+        return llm.bind(response_format={"type": "json_object"}), True
+    return llm, False
+
+
+def _rejects_json_mode(error: BadRequestError) -> bool:
+    """Whether a 400 is the provider refusing `response_format`, not a problem with the request itself."""
+    # param/message of the provider's error body, or its raw text if it wasn't JSON
+    details = " ".join(str(part) for part in (error.param, error.body, error.message) if part).lower()
+    return "response_format" in details or "json_object" in details or "json mode" in details
+
+
+def _json_mode_rejected():
+    """Remember that the current provider refuses `response_format`."""
+    _json_mode_unsupported.add((_settings()["base_url"], _settings()["model"]))
+
+
+# Identical requests currently being sent, keyed by prompt + model + options
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _join_flight(key: str) -> tuple:
+    """(future, is_leader): the first caller for a key leads, later ones wait on it."""
+    with _inflight_lock:
+        flight = _inflight.get(key)
+        if flight is not None:
+            return flight, False
+        flight = _inflight[key] = Future()
+        return flight, True
+
+
+def _land_flight(key: str, flight: Future, text: str = None, error: BaseException = None, aborted: bool = False):
+    """Publish the leader's outcome to every waiter and retire the key."""
+    with _inflight_lock:
+        if _inflight.get(key) is flight:
+            del _inflight[key]
+    if aborted:
+        # Waiters see a cancelled flight and retry on their own
+        flight.cancel()
+    elif error is not None:
+        flight.set_exception(error)
+    else:
+        flight.set_result(text)
+
+
+def complete(messages: list, temperature: float = 0.1, validate=None, json_mode: bool = False) -> str:
+    """Invoke the LLM and return the response text, served from cache when possible.
+
+    Responses are only cached if `validate(text)` is truthy (when given), so a
+    malformed answer is retried on the next call instead of replayed. With
+    `json_mode`, the provider's JSON response format is used where supported.
+
+    Concurrent identical calls (same prompt, model and options) share one
+    provider request: the first caller sends it and the rest wait for its
+    text or its exception. If that first caller is interrupted before the
+    answer arrives, the others retry as if they had come first.
+    """
+    key = cache_key(messages, temperature)
+    flight_key = make_key(key, json_mode)
+    while True:
+        cached = llm_cache.get(key)
+        if cached is not None:
+            return cached
+        flight, leader = _join_flight(flight_key)
+        if leader:
+            break
+        metrics.incr("llm.coalesced")
+        try:
+            return flight.result()
+        except CancelledError:
+            continue
+    
+    try:
+        text = _call(messages, temperature, validate, json_mode, key)
+    except Exception as e:
+        _land_flight(flight_key, flight, error=e)
+        raise
+    except BaseException:
+        _land_flight(flight_key, flight, aborted=True)
+        raise
+    _land_flight(flight_key, flight, text)
+    return text
+
+
+def _call(messages: list, temperature: float, validate, json_mode: bool, key: str) -> str:
+    """One provider request for `complete`."""
+    start = time.perf_counter()
+    limiter, tokens = rate_limiter(), _estimate_tokens(messages)
+    runnable, bound = _runnable(temperature, json_mode)
+    try:
+        response = limiter.call(lambda: runnable.invoke(messages), tokens, _used_tokens)
+    except BadRequestError as e:
+        if not bound or not _rejects_json_mode(e):
+            raise
+        _json_mode_rejected()
+        response = limiter.call(lambda: get_llm(temperature).invoke(messages), tokens, _used_tokens)
+    text = response.content
+    _record_usage(messages, text, response, time.perf_counter() - start)
+    if validate is None or validate(text):
+        llm_cache.set(key, text)
+    return text
+
+
+def stream_complete(messages: list, temperature: float = 0.1):
+    """Yield response tokens as they arrive; a cache hit yields the whole text at once.
+
+    The full text is cached only if the stream is consumed to the end.
+    """
+    key = cache_key(messages, temperature)
+    cached = llm_cache.get(key)
+    if cached is not None:
+        yield cached
+        return
+    
+    start = time.perf_counter()
+    parts = []
+    llm = get_llm(temperature, streaming=True)
+    for chunk in rate_limiter().stream(lambda: llm.stream(messages), _estimate_tokens(messages)):
+        if chunk.content:
+            parts.append(chunk.content)
+            yield chunk.content
+    text = "".join(parts)
+    _record_usage(messages, text, seconds=time.perf_counter() - start, streaming=True)
+    llm_cache.set(key, text)
+
+
+async def acomplete(messages: list, temperature: float = 0.1, validate=None, json_mode: bool = False) -> str:
+    """Async `complete` — awaits `llm.ainvoke` instead of blocking a thread.
+
+    Shares in-flight requests with `complete` and other `acomplete` calls.
+    The provider request runs as its own task, so cancelling any caller
+    (the first one included) only stops that caller's wait; the request
+    still finishes for everyone else and its answer is cached.
+    """
+    key = cache_key(messages, temperature)
+    flight_key = make_key(key, json_mode)
+    while True:
+        cached = llm_cache.get(key)
+        if cached is not None:
+            return cached
+        flight, leader = _join_flight(flight_key)
+        if leader:
+            break
+        metrics.incr("llm.coalesced")
+        try:
+            return await asyncio.shield(asyncio.wrap_future(flight))
+        except asyncio.CancelledError:
+            if flight.cancelled():
+                continue
+            raise
+    
+    task = asyncio.ensure_future(_acall(messages, temperature, validate, json_mode, key))
+    
+    def land(task):
+        if task.cancelled():
+            _land_flight(flight_key, flight, aborted=True)
+        elif task.exception() is not None:
+            _land_flight(flight_key, flight, error=task.exception())
+        else:
+            _land_flight(flight_key, flight, task.result())
+    
+    task.add_done_callback(land)
+    return await asyncio.shield(task)
+
+
+async def _acall(messages: list, temperature: float, validate, json_mode: bool, key: str) -> str:
+    """One provider request for `acomplete`."""
+    start = time.perf_counter()
+    limiter, tokens = rate_limiter(), _estimate_tokens(messages)
+    runnable, bound = _runnable(temperature, json_mode)
+    try:
+        response = await limiter.acall(lambda: runnable.ainvoke(messages), tokens, _used_tokens)
+    except BadRequestError as e:
+        if not bound or not _rejects_json_mode(e):
+            raise
+        _json_mode_rejected()
+        response = await limiter.acall(lambda: get_llm(temperature).ainvoke(messages), tokens, _used_tokens)
+    text = response.content
+    _record_usage(messages, text, response, time.perf_counter() - start)
+    if validate is None or validate(text):
+        llm_cache.set(key, text)
+    return text
+
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """One event loop per process, running in a daemon thread."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="llm-loop", daemon=True).start()
+    return _loop
+
+
+def run_sync(coro):
+    """Run a coroutine on the shared background loop and wait for its result.
+
+    Safe to call from Streamlit script threads and from code that already
+    has its own running loop.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
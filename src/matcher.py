@@ -0,0 +1,130 @@
+"""Skill matcher — finds every known skill in a text with one compiled regex."""
+
+import re
+
+
+def _is_word_char(ch: str) -> bool:
+    """Same notion of a word character as the regex `\\w` class."""
+    return ch.isalnum() or ch == "_"
+
+
+class SkillMatcher:
+    """Matches a fixed skill vocabulary against text in a single scan.
+
+    The vocabulary is folded into a trie and emitted as one regex, so the
+    per-character cost depends on the length of the longest skill, not on
+    how many skills there are. Hard skills must stand alone as words
+    (`c++`, `c#`, `ci/cd` and `next.js` included; `.net` may also close a
+    word as in "asp.net"); soft skills only need to start a word, so
+    "stakeholder" still matches "stakeholders". Nothing matches after a
+    dot inside a name, so "node.js" is not also "js".
+
+    `aliases` maps alternative spellings to a skill ("k8s" -> "kubernetes").
+    Aliases are matched like their skill, but results always use the
+    canonical name.
+    """
+
+    def __init__(self, hard_skills=(), soft_skills=(), aliases=None):
+        self.hard_skills = list(dict.fromkeys(s.lower() for s in hard_skills))
+        self.soft_skills = list(dict.fromkeys(s.lower() for s in soft_skills if s.lower() not in self.hard_skills))
+        self._canonical = {s: s for s in self.hard_skills + self.soft_skills}
+        for alias, skill in (aliases or {}).items():
+            alias, skill = alias.lower(), skill.lower()
+            if skill in self._canonical and alias not in self._canonical:
+                self._canonical[alias] = skill
+        hard = set(self.hard_skills)
+        self._whole_word = {term: skill in hard for term, skill in self._canonical.items()}
+
+        trie = {}
+        for term in self._whole_word:
+            node = trie
+            for ch in term:
+                node = node.setdefault(ch, {})
+            node[""] = term
+
+        self._trie = trie
+        self._contained = {term: self._find_contained(term) for term in self._whole_word}
+        self._pattern = re.compile(r"(?=(" + self._to_regex(trie, root=True) + "))") if trie else None
+
+    def __len__(self):
+        return len(self.hard_skills) + len(self.soft_skills)
+
+    def __contains__(self, term):
+        """True for canonical skills; aliases are not skills in their own right."""
+        return self._canonical.get(term) == term
+
+    def _to_regex(self, node: dict, root: bool = False) -> str:
+        """Emit a trie node as a regex, longest alternatives first."""
+        branches = []
+        for ch, child in sorted(node.items()):
+            if not ch:
+                continue
+            # Collapse single-child chains into one literal run
+            run = ch
+            while len(child) == 1 and "" not in child:
+                (next_ch, child), = child.items()
+                run += next_ch
+            # Skills that start with a letter must also start a word, and not the
+            # suffix of a dotted name ("js" in "node.js"); ".net" may follow "asp"
+            start = r"(?<!\w)(?<!\w\.)" if root and _is_word_char(ch) else ""
+            branches.append(start + re.escape(run) + self._to_regex(child))
+        if "" in node:
+            branches.append(r"(?!\w)" if self._whole_word[node[""]] else "")
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    def _find_contained(self, term: str) -> list:
+        """Other skills that occur inside `term`, as (skill, needs_end_check)."""
+        found = []
+        word = [_is_word_char(ch) for ch in term]
+        for i in range(len(term)):
+            # Same start rule as the pattern: not inside a word, nor after "word."
+            if word[i] and (i and word[i - 1] or i > 1 and term[i - 1] == "." and word[i - 2]):
+                continue
+            node = self._trie
+            for j in range(i, len(term)):
+                node = node.get(term[j])
+                if node is None:
+                    break
+                other = node.get("")
+                if other is None or other == term:
+                    continue
+                if not self._whole_word[other]:
+                    found.append((other, False))
+                elif j + 1 < len(term):
+                    if not word[j + 1]:
+                        found.append((other, False))
+                elif i:
+                    found.append((other, not self._whole_word[term]))
+        return found
+
+    def find(self, text: str, lowered: bool = False) -> set:
+        """Return the set of skills present in `text` (case-insensitive).
+
+        Pass `lowered=True` if `text` is already lowercase to skip the copy.
+        """
+        if self._pattern is None:
+            return set()
+        if not lowered:
+            text = text.lower()
+        found = set()
+        canonical = self._canonical
+        for m in self._pattern.finditer(text):
+            term = m.group(1)
+            found.add(canonical[term])
+            for other, needs_end_check in self._contained[term]:
+                if needs_end_check:
+                    end = m.start() + len(term)
+                    if end < len(text) and _is_word_char(text[end]):
+                        continue
+                found.add(canonical[other])
+        return found
+
+    def scan(self, text: str) -> dict:
+        """Return found hard and soft skills, each in vocabulary order."""
+        found = self.find(text)
+        return {
+            "hard_skills": [s for s in self.hard_skills if s in found],
+            "soft_skills": [s for s in self.soft_skills if s in found],
+        }
@@ -0,0 +1,36 @@
+"""Metrics — process-wide counters and recent event records."""
+
+import threading
+import time
+from collections import defaultdict, deque
+
+RECENT_EVENTS = 500
+
+_lock = threading.Lock()
+_counters = defaultdict(float)
+_events = defaultdict(lambda: deque(maxlen=RECENT_EVENTS))
+
+
+def incr(name: str, value: float = 1):
+    """Add `value` to a counter."""
+    with _lock:
+        _counters[name] += value
+
+
+def record(name: str, **fields):
+    """Append a timestamped event (only the most recent ones are kept)."""
+    fields["ts"] = time.time()
+    with _lock:
+        _events[name].append(fields)
+
+
+def counters(prefix: str = "") -> dict:
+    """Current counter values, optionally filtered by name prefix."""
+    with _lock:
+        return {k: v for k, v in _counters.items() if k.startswith(prefix)}
+
+
+def events(name: str) -> list:
+    """Recent events recorded under `name`, oldest first."""
+    with _lock:
+        return list(_events[name])
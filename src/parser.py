@@ -1,40 +1,119 @@
 """Resume & JD parser — extracts text, sections, and structured data."""
 
+import io
 import re
 import os
-import tempfile
+import hashlib
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from pypdf import PdfReader
+from src.cache import TieredCache, make_key
+from src.config import Config
+from src.matcher import SkillMatcher
+from src.procs import spawn_context
+from src.taxonomy import get_taxonomy
 
+# Parsed text, sections and contact info, keyed by content hash
+parse_cache = TieredCache(
+    maxsize=Config.PARSE_CACHE_SIZE,
+    directory=Config.PARSE_CACHE_DIR or None,
+    ttl=Config.PARSE_CACHE_TTL,
+    max_bytes=Config.PARSE_CACHE_MAX_MB * 2**20,
+)
 
-def extract_text_from_pdf(file_bytes: bytes) -> str:
-    """Extract text from PDF bytes."""
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        tmp.write(file_bytes)
-        tmp_path = tmp.name
+def _extract_pages(file_bytes: bytes, start: int, stop: int) -> list:
+    """Text of pages [start, stop) — runs in a worker process for big PDFs."""
+    reader = PdfReader(io.BytesIO(file_bytes))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
 
+
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """Process pool for page-parallel extraction, created on first use."""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=Config.PDF_WORKERS,
+                mp_context=spawn_context(),
+            )
+    return _pdf_pool
+
+
+def _reset_pdf_pool():
+    """Drop a broken pool so the next large PDF starts a fresh one."""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        _pdf_pool = None
+
+
+def extract_text_from_pdf(file_bytes: bytes, parallel: bool = True, max_pages: int = None) -> str:
+    """Extract text from PDF bytes, in memory.
+
+    Documents with at least PDF_PARALLEL_MIN_PAGES pages are split into
+    contiguous page ranges and extracted on a process pool; page order is
+    kept and the text is joined once at the end. Raises ValueError for PDFs
+    with more than `max_pages` pages, before any text is extracted.
+    """
+    reader = PdfReader(io.BytesIO(file_bytes))
+    n_pages = len(reader.pages)
+    if max_pages is not None and n_pages > max_pages:
+        raise ValueError(f"PDF has {n_pages} pages; the limit is {max_pages}")
+    
+    if not parallel or Config.PDF_WORKERS < 2 or n_pages < Config.PDF_PARALLEL_MIN_PAGES:
+        pages = [page.extract_text() or "" for page in reader.pages]
+        return "".join(pages).strip()
+    
+    n_chunks = min(Config.PDF_WORKERS, n_pages)
+    bounds = [n_pages * i // n_chunks for i in range(n_chunks + 1)]
     try:
-        reader = PdfReader(tmp_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() or ""
-        return text.strip()
-    finally:
-        os.unlink(tmp_path)
+        chunks = _get_pdf_pool().map(_extract_pages, [file_bytes] * n_chunks, bounds[:-1], bounds[1:])
+        pages = [page for chunk in chunks for page in chunk]
+    except BrokenProcessPool:
+        _reset_pdf_pool()
+        pages = [page.extract_text() or "" for page in reader.pages]
+    return "".join(pages).strip()
 
 
 def extract_text_from_docx(file_bytes: bytes) -> str:
     """Extract text from DOCX bytes."""
     from docx import Document
-    import io
     doc = Document(io.BytesIO(file_bytes))
     return "\n".join([p.text for p in doc.paragraphs if p.text.strip()])
 
 
-def extract_resume_text(file_bytes: bytes, filename: str) -> str:
-    """Extract text from resume file (PDF or DOCX)."""
+def content_hash(data) -> str:
+    """SHA-256 hex digest of upload bytes or text."""
+    if isinstance(data, str):
+        data = data.encode("utf-8", errors="surrogatepass")
+    return hashlib.sha256(data).hexdigest()
+
+
+def text_cache_key(file_bytes: bytes, ext: str) -> str:
+    """Parse-cache key for the extracted text of an upload."""
+    return make_key("text", content_hash(file_bytes), ext)
+
+
+def extract_resume_text(file_bytes: bytes, filename: str, parallel: bool = True) -> str:
+    """Extract text from resume file (PDF or DOCX), cached by upload content."""
     ext = os.path.splitext(filename)[1].lower()
+    key = text_cache_key(file_bytes, ext)
+    text = parse_cache.get(key)
+    if text is None:
+        text = _decode_resume(file_bytes, ext, parallel)
+        parse_cache.set(key, text)
+    return text
+
+
+def _decode_resume(file_bytes: bytes, ext: str, parallel: bool = True) -> str:
+    """Uncached text extraction by file extension."""
     if ext == ".pdf":
-        return extract_text_from_pdf(file_bytes)
+        return extract_text_from_pdf(file_bytes, parallel=parallel)
     elif ext in (".docx", ".doc"):
         return extract_text_from_docx(file_bytes)
     elif ext in (".txt", ".md"):
@@ -44,7 +123,17 @@ def extract_resume_text(file_bytes: bytes, filename: str) -> str:
 
 
 def extract_contact_info(text: str) -> dict:
-    """Extract email, phone, name from resume text."""
+    """Extract email, phone, name from resume text (cached by content)."""
+    key = make_key("contact", content_hash(text))
+    contact = parse_cache.get(key)
+    if contact is None:
+        contact = _find_contact_info(text)
+        parse_cache.set(key, contact)
+    return dict(contact)
+
+
+def _find_contact_info(text: str) -> dict:
+    """Uncached contact extraction."""
     email = re.findall(r'[\w.+-]+@[\w-]+\.[\w.-]+', text)
     phone = re.findall(r'[\+]?[\d\s\-\(\)]{10,15}', text)
     
@@ -63,64 +152,145 @@ def extract_contact_info(text: str) -> dict:
 
 
 def extract_sections(text: str) -> dict:
-    """Split resume into sections (experience, education, skills, etc.)."""
-    section_headers = {
-        "summary": r"(?i)(summary|objective|profile|about\s*me)",
-        "experience": r"(?i)(experience|work\s*history|employment|professional\s*experience)",
-        "education": r"(?i)(education|academic|qualification|degree)",
-        "skills": r"(?i)(skills|technical\s*skills|technologies|competenc)",
-        "projects": r"(?i)(projects|portfolio|personal\s*projects)",
-        "certifications": r"(?i)(certification|certificate|license|credential)",
-    }
+    """Split resume into sections (experience, education, skills, etc.), cached by content."""
+    key = make_key("sections", content_hash(text), SECTION_HEADERS)
+    sections = parse_cache.get(key)
+    if sections is None:
+        sections = _split_sections(text)
+        parse_cache.set(key, sections)
+    return dict(sections)
+
+
+# Section header vocabulary: name -> case-insensitive pattern, checked in order
+SECTION_HEADERS = {
+    "summary": r"summary|objective|profile|about\s*me",
+    "experience": r"experience|work\s*history|employment|professional\s*experience",
+    "education": r"education|academic|qualification|degree",
+    "skills": r"skills|technical\s*skills|technologies|competenc",
+    "projects": r"projects|portfolio|personal\s*projects",
+    "certifications": r"certification|certificate|license|credential",
+}
+# Lines this long (after stripping) are body text, never headers
+MAX_HEADER_LEN = 60
+
+
+def register_section_header(name: str, pattern: str):
+    """Add a header pattern for `name` (new or existing section).
+
+    Patterns are matched case-insensitively anywhere in a short line; for an
+    existing section the new pattern is tried alongside the old one.
+    """
+    current = SECTION_HEADERS.get(name)
+    SECTION_HEADERS[name] = f"{current}|{pattern}" if current else pattern
+    _header_regex.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def _header_regex():
+    """One compiled alternation over all header patterns, in priority order.
+
+    Each section is a lookahead branch anchored at the line start, so the
+    first section in SECTION_HEADERS that occurs anywhere in the line wins,
+    as with the old per-pattern loop, but in a single `match` call.
+    """
+    names = list(SECTION_HEADERS)
+    branches = [f"(?=.*?(?P<s{i}>{SECTION_HEADERS[name]}))" for i, name in enumerate(names)]
+    return re.compile("|".join(branches), re.IGNORECASE), names
+
+
+def _split_sections(text: str) -> dict:
+    """Uncached section splitter."""
+    # A repeated header overwrites the earlier section, as it always has
+    return dict(iter_sections(text))
+
+
+def _iter_lines(source):
+    """Lines of a string or text stream without newlines, like `str.split('\\n')`."""
+    if isinstance(source, str):
+        source = io.StringIO(source)
+    ended = True
+    for line in source:
+        ended = line.endswith("\n")
+        yield line[:-1] if ended else line
+    # split('\n') also returns the empty piece after a final newline
+    if ended:
+        yield ""
+
+
+def iter_sections(source, only=None, max_chunk_chars: int = None):
+    """Lazily split a resume into `(section_name, text)` chunks.
+
+    `source` is a string or any iterable of lines (an open text file, a
+    StringIO); only the current section is held in memory. With `only`,
+    other sections are skipped without being buffered and parsing stops
+    once each requested section has been yielded. With `max_chunk_chars`,
+    long sections come out as several consecutive unstripped pieces
+    (join them with "\\n" and strip to get the section text), so memory
+    stays flat however large a single section is.
+    """
+    regex, names = _header_regex()
+    match = regex.match
+    remaining = set(only) if only is not None else None
+    if remaining is not None and not remaining:
+        return
     
-    sections = {}
-    lines = text.split('\n')
     current_section = "header"
     current_lines = []
+    size = 0
+    seen_lines = chunked = False
+    keep = remaining is None or current_section in remaining
     
-    for line in lines:
-        matched = False
-        for section_name, pattern in section_headers.items():
-            if re.search(pattern, line) and len(line.strip()) < 60:
-                # Save previous section
+    for line in _iter_lines(source):
+        # Cheap shape filters before any regex work
+        m = None
+        if len(line) < MAX_HEADER_LEN or len(line.strip()) < MAX_HEADER_LEN:
+            m = match(line)
+        if m is None:
+            seen_lines = True
+            if keep:
+                current_lines.append(line)
+                size += len(line) + 1
+                if max_chunk_chars and size > max_chunk_chars:
+                    yield current_section, '\n'.join(current_lines)
+                    current_lines, size, chunked = [], 0, True
+            continue
+        
+        # Finish the previous section
+        if seen_lines and keep:
+            if chunked:
                 if current_lines:
-                    sections[current_section] = '\n'.join(current_lines).strip()
-                current_section = section_name
-                current_lines = []
-                matched = True
-                break
-        if not matched:
-            current_lines.append(line)
-    
-    # Save last section
-    if current_lines:
-        sections[current_section] = '\n'.join(current_lines).strip()
+                    yield current_section, '\n'.join(current_lines)
+            else:
+                yield current_section, '\n'.join(current_lines).strip()
+            if remaining is not None:
+                remaining.discard(current_section)
+                if not remaining:
+                    return
+        current_section = names[int(m.lastgroup[1:])]
+        current_lines, size = [], 0
+        seen_lines = chunked = False
+        keep = remaining is None or current_section in remaining
     
-    return sections
+    # Last section
+    if seen_lines and keep:
+        if chunked:
+            if current_lines:
+                yield current_section, '\n'.join(current_lines)
+        else:
+            yield current_section, '\n'.join(current_lines).strip()
+
+
+def get_skill_matcher() -> SkillMatcher:
+    """Matcher for the current skill taxonomy (hard + soft skills and their aliases)."""
+    return get_taxonomy().matcher
 
 
 def extract_keywords_from_jd(jd_text: str) -> dict:
     """Extract key requirements from job description using regex patterns."""
-    # Common tech skills
-    tech_skills = [
-        "python", "java", "javascript", "typescript", "react", "angular", "vue",
-        "node", "express", "django", "flask", "fastapi", "spring", "docker",
-        "kubernetes", "aws", "azure", "gcp", "sql", "nosql", "mongodb",
-        "postgresql", "mysql", "redis", "git", "ci/cd", "jenkins", "terraform",
-        "linux", "agile", "scrum", "rest", "api", "graphql", "microservices",
-        "machine learning", "deep learning", "nlp", "tensorflow", "pytorch",
-        "pandas", "numpy", "scikit-learn", "streamlit", "langchain",
-        "html", "css", "tailwind", "figma", "excel", "power bi", "tableau",
-        "c++", "c#", ".net", "rust", "go", "kotlin", "swift", "flutter",
-        "react native", "next.js", "nest.js", "firebase", "supabase",
-    ]
-    
     jd_lower = jd_text.lower()
     
-    found_skills = []
-    for skill in tech_skills:
-        if re.search(r'\b' + re.escape(skill) + r'\b', jd_lower):
-            found_skills.append(skill)
+    # Hard + soft skills in one pass
+    skills = get_skill_matcher().scan(jd_lower)
     
     # Extract years of experience
     years_match = re.findall(r'(\d+)\+?\s*(?:years?|yrs?)\s*(?:of)?\s*(?:experience)?', jd_lower)
@@ -135,20 +305,9 @@ def extract_keywords_from_jd(jd_text: str) -> dict:
     if re.search(r"(?i)(ph\.?d|doctorate)", jd_lower):
         education.append("PhD")
     
-    # Extract soft skills
-    soft_skills = []
-    soft_patterns = [
-        "communication", "leadership", "teamwork", "problem solving",
-        "analytical", "creative", "time management", "collaboration",
-        "presentation", "mentoring", "stakeholder",
-    ]
-    for skill in soft_patterns:
-        if skill in jd_lower:
-            soft_skills.append(skill)
-    
     return {
-        "hard_skills": found_skills,
-        "soft_skills": soft_skills,
+        "hard_skills": skills["hard_skills"],
+        "soft_skills": skills["soft_skills"],
         "min_years": min_years,
         "education": education,
     }
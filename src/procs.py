@@ -0,0 +1,47 @@
+"""Worker processes — a spawn context that never re-runs the page script.
+
+Spawned children re-import the parent's `__main__` from its `__file__`.
+Under `streamlit run` that is the page script (app.py or a page), so every
+worker would execute the whole app on startup. Workers here only run
+functions from `src`, so the main script is hidden while they start.
+"""
+
+import multiprocessing
+import sys
+import threading
+from contextlib import contextmanager
+from multiprocessing.context import SpawnContext, SpawnProcess
+
+_main_lock = threading.Lock()
+_MISSING = object()
+
+
+@contextmanager
+def _main_script_hidden():
+    """Temporarily drop `__main__.__file__` so spawn doesn't re-run it in the child."""
+    with _main_lock:
+        main = sys.modules.get("__main__")
+        path = main.__dict__.pop("__file__", _MISSING) if main is not None else _MISSING
+        try:
+            yield
+        finally:
+            if path is not _MISSING:
+                main.__file__ = path
+
+
+class _Process(SpawnProcess):
+    def start(self):
+        with _main_script_hidden():
+            super().start()
+
+
+class _Context(SpawnContext):
+    Process = _Process
+
+
+_context = _Context()
+
+
+def spawn_context() -> multiprocessing.context.BaseContext:
+    """Spawn context for worker processes and pools (Process, Pipe, ProcessPoolExecutor)."""
+    return _context
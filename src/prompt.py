@@ -0,0 +1,105 @@
+"""Prompt builder — token counting and budgeted prompt assembly."""
+
+import os
+from functools import lru_cache
+
+import tiktoken
+
+FALLBACK_ENCODING = "cl100k_base"
+# Rough chars-per-token when no tokenizer is available (e.g. offline)
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=16)
+def _encoding(model: str):
+    """tiktoken encoding for a model, `cl100k_base` for unknown ones, or None."""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        pass
+    except Exception:
+        return None
+    try:
+        return tiktoken.get_encoding(FALLBACK_ENCODING)
+    except Exception:
+        return None
+
+
+def _model(model: str = None) -> str:
+    return model or os.getenv("LLM_MODEL", "mistral-large-3:675b")
+
+
+def count_tokens(text: str, model: str = None) -> int:
+    """Number of tokens `text` uses for `model` (estimated if no tokenizer loads)."""
+    enc = _encoding(_model(model))
+    if enc is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(enc.encode(text, disallowed_special=()))
+
+
+def truncate_tokens(text: str, max_tokens: int, model: str = None) -> str:
+    """Cut `text` to at most `max_tokens` tokens, backing off to a word boundary."""
+    if max_tokens <= 0:
+        return ""
+    enc = _encoding(_model(model))
+    if enc is None:
+        limit = max_tokens * CHARS_PER_TOKEN
+        if len(text) <= limit:
+            return text
+        cut = text[:limit]
+    else:
+        tokens = enc.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        cut = enc.decode(tokens[:max_tokens])
+    # Don't end mid-word
+    space = max(cut.rfind(" "), cut.rfind("\n"))
+    if space > len(cut) // 2:
+        cut = cut[:space]
+    return cut.rstrip()
+
+
+class PromptTooLongError(ValueError):
+    """The template and its fixed fields alone exceed the budget."""
+
+    def __init__(self, message: str, tokens: int, budget: int):
+        super().__init__(message)
+        self.tokens = tokens
+        self.budget = budget
+
+
+class PromptBuilder:
+    """Fills a `str.format` template within a token budget.
+
+    Variable-length inputs are added with a priority and an optional cap.
+    They are filled highest priority first, each taking what it needs (up to
+    its cap) from whatever budget the template and earlier inputs left.
+    Text that must reach the model whole goes in as a `render` field.
+    """
+
+    def __init__(self, template: str, budget: int, model: str = None):
+        self.template = template
+        self.budget = budget
+        self.model = _model(model)
+        self._parts = []
+
+    def add(self, name: str, text: str, priority: int = 0, max_tokens: int = None) -> "PromptBuilder":
+        self._parts.append((name, text, priority, max_tokens))
+        return self
+
+    def render(self, **fields) -> str:
+        """Render the prompt; `fields` are inserted as-is and never truncated.
+
+        Raises PromptTooLongError if the fields don't fit the budget.
+        """
+        empty = {name: "" for name, *_ in self._parts}
+        fixed = count_tokens(self.template.format(**fields, **empty), self.model)
+        if fixed > self.budget:
+            raise PromptTooLongError(f"Prompt needs {fixed} tokens; the budget is {self.budget}", fixed, self.budget)
+        remaining = self.budget - fixed
+        values = {}
+        for name, text, _, max_tokens in sorted(self._parts, key=lambda p: -p[2]):
+            limit = remaining if max_tokens is None else min(max_tokens, remaining)
+            values[name] = truncate_tokens(text, limit, self.model)
+            remaining -= count_tokens(values[name], self.model)
+        return self.template.format(**fields, **values)
@@ -0,0 +1,367 @@
+"""Rate limiting — one shared budget of requests, tokens and concurrency per provider.
+
+Every provider call in the process goes through a RateLimiter: it waits
+for a concurrency slot, then for room in the requests-per-minute and
+tokens-per-minute buckets. The concurrency limit adapts (AIMD): it grows
+slowly while calls succeed and halves when the provider answers 429 or
+times out. Throttled and transient failures are retried with jittered
+backoff, honoring the provider's Retry-After.
+"""
+
+import asyncio
+import email.utils
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import httpx
+from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+
+from src import metrics
+from src.config import Config
+
+
+class TokenBucket:
+    """Continuously refilled budget of `per_minute` units, holding at most a minute's worth.
+
+    `reserve` takes units immediately and may leave the balance negative;
+    the return value is how long the caller must wait for it to be repaid,
+    so callers are served in the order they reserved.
+    """
+
+    def __init__(self, per_minute: float):
+        self.per_minute = per_minute
+        self.capacity = per_minute
+        self._balance = per_minute
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._balance = min(self.capacity, self._balance + (now - self._updated) * self.per_minute / 60)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take `amount` units; seconds until the balance is back to zero."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._balance -= amount
+            return max(0.0, -self._balance * 60 / self.per_minute)
+
+    def refund(self, amount: float):
+        """Give back (or, if negative, take more of) a reservation once the real cost is known."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._balance = min(self.capacity, self._balance + amount)
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._balance
+
+
+class _Waiter:
+    __slots__ = ("notify", "granted")
+
+    def __init__(self, notify):
+        self.notify = notify
+        self.granted = False
+
+
+class Permit:
+    """One admitted call; use with `with` (threads) or `async with` (coroutines).
+
+    Exiting records the outcome for the concurrency controller. Set `used`
+    to the call's real token count to correct the token bucket.
+    """
+
+    def __init__(self, limiter, tokens: int):
+        self.limiter = limiter
+        self.tokens = tokens
+        self.used = None
+        self._started = 0.0
+
+    def __enter__(self):
+        self.limiter._take_slot()
+        try:
+            delay = self.limiter._reserve(self.tokens)
+            if delay:
+                with self.limiter._waiting(delay):
+                    time.sleep(delay)
+        except BaseException:
+            self.limiter._give_slot("error", time.monotonic())
+            raise
+        self._started = time.monotonic()
+        return self
+
+    async def __aenter__(self):
+        await self.limiter._atake_slot()
+        try:
+            delay = self.limiter._reserve(self.tokens)
+            if delay:
+                with self.limiter._waiting(delay):
+                    await asyncio.sleep(delay)
+        except BaseException:
+            self.limiter._give_slot("error", time.monotonic())
+            raise
+        self._started = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._finish(exc)
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._finish(exc)
+
+    def _finish(self, exc):
+        if self.used is not None and self.limiter.token_bucket is not None:
+            self.limiter.token_bucket.refund(self.tokens - self.used)
+        outcome = "ok" if exc is None else "throttled" if is_congestion(exc) else "error"
+        self.limiter._give_slot(outcome, self._started)
+
+
+def is_congestion(error: BaseException) -> bool:
+    """Provider overload signals: 429s and timeouts."""
+    return isinstance(error, (RateLimitError, APITimeoutError, httpx.TimeoutException))
+
+
+def _is_transient(error: BaseException) -> bool:
+    return is_congestion(error) or isinstance(error, (APIConnectionError, InternalServerError))
+
+
+def retry_after(error: BaseException) -> float:
+    """Seconds the provider asked us to wait (Retry-After / retry-after-ms), or None."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Shared RPM/TPM buckets plus an adaptive concurrency window.
+
+    `rpm` / `tpm` of 0 disable that bucket. The window starts at
+    `max_concurrency`, gains about one slot per window of successful calls,
+    and halves (down to `min_concurrency`) at most once per congestion
+    episode. Waiting callers are admitted in arrival order.
+    """
+
+    def __init__(self, rpm: float = None, tpm: float = None, max_concurrency: int = None,
+                 min_concurrency: int = None, max_retries: int = None, backoff: float = None,
+                 max_backoff: float = None):
+        rpm = Config.LLM_RPM if rpm is None else rpm
+        tpm = Config.LLM_TPM if tpm is None else tpm
+        self.request_bucket = TokenBucket(rpm) if rpm else None
+        self.token_bucket = TokenBucket(tpm) if tpm else None
+        self.max_concurrency = max_concurrency or Config.LLM_MAX_CONCURRENCY
+        self.min_concurrency = min(min_concurrency or Config.LLM_MIN_CONCURRENCY, self.max_concurrency)
+        self.max_retries = Config.LLM_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff = backoff or Config.LLM_RETRY_BACKOFF
+        self.max_backoff = max_backoff or Config.LLM_RETRY_MAX_BACKOFF
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self._waiters = deque()
+        self._delayed_count = 0
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def _has_room(self) -> bool:
+        return self.in_flight < int(self.limit)
+
+    def _wake(self):
+        # Caller holds the lock; hand free slots to waiters in order
+        while self._waiters and self._has_room():
+            waiter = self._waiters.popleft()
+            waiter.granted = True
+            self.in_flight += 1
+            waiter.notify()
+
+    def _take_slot(self):
+        with self._lock:
+            if not self._waiters and self._has_room():
+                self.in_flight += 1
+                return
+            event = threading.Event()
+            self._waiters.append(_Waiter(event.set))
+        event.wait()
+
+    async def _atake_slot(self):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def wake():
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+        with self._lock:
+            if not self._waiters and self._has_room():
+                self.in_flight += 1
+                return
+            waiter = _Waiter(wake)
+            self._waiters.append(waiter)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    self.in_flight -= 1
+                    self._wake()
+                else:
+                    self._waiters.remove(waiter)
+            raise
+
+    def _give_slot(self, outcome: str, started: float):
+        with self._lock:
+            self.in_flight -= 1
+            if outcome == "throttled":
+                # Calls admitted before the last cut were sent under the old
+                # window; their failures are the same episode, not a new one
+                if started >= self._last_decrease:
+                    self.limit = max(float(self.min_concurrency), self.limit / 2)
+                    self._last_decrease = time.monotonic()
+                    metrics.record("llm.backoff", limit=int(self.limit))
+            elif outcome == "ok":
+                self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+            self._wake()
+
+    def _reserve(self, tokens: int) -> float:
+        delay = self._paused_until - time.monotonic()
+        if self.request_bucket is not None:
+            delay = max(delay, self.request_bucket.reserve(1))
+        if self.token_bucket is not None and tokens:
+            delay = max(delay, self.token_bucket.reserve(tokens))
+        return max(0.0, delay)
+
+    @contextmanager
+    def _waiting(self, seconds: float):
+        """Count a caller sleeping off the buckets as queued."""
+        metrics.incr("llm.ratelimit_wait_seconds", seconds)
+        with self._lock:
+            self._delayed_count += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._delayed_count -= 1
+
+    def pause(self, seconds: float):
+        """Hold back every new call for `seconds` (the provider asked us to)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def permit(self, tokens: int = 0) -> Permit:
+        """Admission for one call expected to cost `tokens`."""
+        return Permit(self, tokens)
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        """Seconds to wait before retrying `error`, or None to give up."""
+        if attempt >= self.max_retries or not _is_transient(error):
+            return None
+        asked = retry_after(error)
+        if asked is not None:
+            if asked > self.max_backoff:
+                return None
+            self.pause(asked)
+            delay = asked + random.uniform(0, self.backoff)
+        else:
+            # Full jitter keeps retries from a burst from landing together
+            delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        metrics.incr("llm.retries")
+        if isinstance(error, RateLimitError):
+            metrics.incr("llm.rate_limited")
+        return delay
+
+    def call(self, fn, tokens: int = 0, measure=None):
+        """`fn()` under a permit, retried on 429s, timeouts and 5xx.
+
+        `measure(result)` may return the call's real token count.
+        """
+        attempt = 0
+        while True:
+            try:
+                with self.permit(tokens) as permit:
+                    result = fn()
+                    permit.used = measure(result) if measure else None
+                    return result
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+            attempt += 1
+            time.sleep(delay)
+
+    async def acall(self, fn, tokens: int = 0, measure=None):
+        """Async `call`: `fn()` returns an awaitable."""
+        attempt = 0
+        while True:
+            try:
+                async with self.permit(tokens) as permit:
+                    result = await fn()
+                    permit.used = measure(result) if measure else None
+                    return result
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def stream(self, open_stream, tokens: int = 0):
+        """Yield from `open_stream()` under one permit; retried only until the first item arrives."""
+        attempt = 0
+        while True:
+            started = False
+            try:
+                with self.permit(tokens):
+                    for item in open_stream():
+                        started = True
+                        yield item
+                return
+            except Exception as e:
+                delay = None if started else self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+            attempt += 1
+            time.sleep(delay)
+
+    def stats(self) -> dict:
+        """Current limits, usage and queue length."""
+        with self._lock:
+            stats = {
+                "concurrency_limit": int(self.limit),
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self.in_flight,
+                "waiting": len(self._waiters) + self._delayed_count,
+                "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 1),
+            }
+        stats["rpm"] = self.request_bucket.per_minute if self.request_bucket else None
+        stats["tpm"] = self.token_bucket.per_minute if self.token_bucket else None
+        stats["requests_available"] = int(self.request_bucket.available) if self.request_bucket else None
+        stats["tokens_available"] = int(self.token_bucket.available) if self.token_bucket else None
+        return stats
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str = "") -> RateLimiter:
+    """Process-wide limiter for one provider (base URL), created on first use."""
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            limiter = _limiters[provider] = RateLimiter()
+    return limiter
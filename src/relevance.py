@@ -0,0 +1,97 @@
+"""Relevance — local term-overlap similarity between a resume and a job description.
+
+Cheap enough to run before every analysis: it tells an obvious mismatch
+(a nurse's resume against a Kubernetes JD) from a plausible match, so the
+LLM is only asked about the latter.
+"""
+
+import functools
+import math
+import re
+from collections import Counter
+
+from src.document import as_document
+from src.parser import get_skill_matcher
+from src.taxonomy import Taxonomy, get_taxonomy
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+# Function words plus the boilerplate every resume and JD share
+STOPWORDS = frozenset("""
+a about above across after again all also am an and any are as at be been being both but by can could did do
+does doing down during each etc few for from further had has have having he her here hers him his how i if in
+into is it its just me more most my no nor not of off on once only or other our ours out over own per same she
+should so some such than that the their theirs them then there these they this those through to too under until
+up us very via was we were what when where which while who whom why will with within would you your yours
+ability able candidate candidates company experience excellent good great ideal including job join looking
+must new plus preferred required requirements responsibilities responsible role skills strong team teams
+work working year years
+""".split())
+# A hard skill from the taxonomy counts this many times a plain word. Soft
+# skills ("communication", "problem solving") are in nearly every resume and
+# JD, so neither they nor the words that spell them count at all
+SKILL_WEIGHT = 3
+
+
+@functools.lru_cache(maxsize=1)
+def _soft_words(taxonomy: Taxonomy) -> frozenset:
+    """Words of the taxonomy's soft skills and their aliases."""
+    soft = set(taxonomy.soft_skills)
+    names = soft | {alias for alias, name in taxonomy.aliases.items() if name in soft}
+    return frozenset(word for name in names for word in TOKEN_PATTERN.findall(name))
+
+
+def terms(text: str) -> Counter:
+    """Term counts: content words, plus a `skill:<name>` term per hard skill mentioned."""
+    lower = text.lower()
+    taxonomy = get_taxonomy()
+    soft = _soft_words(taxonomy)
+    counts = Counter(t for t in TOKEN_PATTERN.findall(lower) if t not in STOPWORDS and t not in soft and len(t) > 1)
+    hard = frozenset(taxonomy.hard_skills)
+    for skill in get_skill_matcher().find(lower, lowered=True):
+        if skill in hard:
+            counts["skill:" + skill] += SKILL_WEIGHT
+    return counts
+
+
+def vector(counts: Counter) -> dict:
+    """L2-normalized sublinear term frequencies.
+
+    No IDF: fitted on just the JD and one resume it would down-weight
+    exactly the terms the two share. The stopwords, the soft-skill words
+    and SKILL_WEIGHT stand in for a fixed one.
+    """
+    weights = {term: 1 + math.log(count) for term, count in counts.items()}
+    norm = math.sqrt(sum(w * w for w in weights.values()))
+    return {term: w / norm for term, w in weights.items()} if norm else {}
+
+
+def cosine(a: dict, b: dict) -> float:
+    """Cosine similarity of two normalized sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return float(sum(w * b[term] for term, w in a.items() if term in b))
+
+
+def score_relevance(resume, jd_text: str) -> dict:
+    """How much a resume (text or ResumeDocument) talks about what the JD asks for.
+
+    Returns {"score", "resume", "sections"}: cosine similarities in [0, 1].
+    `score` compares the JD with the resume minus its header (name and
+    contact details never share the JD's words), `resume` with the whole
+    text, and `sections` with each section on its own.
+    """
+    doc = as_document(resume)
+    jd_vector = vector(terms(jd_text))
+    sections = {name: terms(text) for name, text in doc.sections.items() if text.strip()}
+    section_scores = {name: round(cosine(jd_vector, vector(counts)), 4) for name, counts in sections.items()}
+    resume_score = round(cosine(jd_vector, vector(terms(doc.text))), 4)
+
+    body = Counter()
+    for name, counts in sections.items():
+        if name != "header":
+            body.update(counts)
+    return {
+        "score": round(cosine(jd_vector, vector(body)), 4) if body else resume_score,
+        "resume": resume_score,
+        "sections": section_scores,
+    }
@@ -1,23 +1,19 @@
 """Rewriter Agent — rewrites resume sections optimized for the job description."""
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from langchain_core.messages import HumanMessage, SystemMessage
-from src.llm import get_llm
+from src.config import Config
+from src.llm import complete, stream_complete
+from src.prompt import PromptBuilder, PromptTooLongError
 
+REWRITE_PROMPT = """You are an expert resume writer and ATS optimizer. Rewrite this resume section to better match the job description.
 
-def rewrite_section(section_name: str, section_text: str, jd_text: str, missing_skills: list) -> str:
-    """Rewrite a single resume section optimized for the JD."""
-    llm = get_llm()
-    
-    missing_str = ", ".join(missing_skills) if missing_skills else "none"
-    
-    prompt = f"""You are an expert resume writer and ATS optimizer. Rewrite this resume section to better match the job description.
-
-SECTION: {section_name.upper()}
+SECTION: {section_name}
 ORIGINAL TEXT:
 {section_text}
 
 JOB DESCRIPTION (key parts):
-{jd_text[:2000]}
+{jd_text}
 
 MISSING SKILLS TO INCORPORATE (if relevant): {missing_str}
 
@@ -32,41 +28,13 @@ RULES:
 
 Output ONLY the rewritten section text. No explanations."""
 
-    response = llm.invoke([
-        SystemMessage(content="You are a professional resume writer. Rewrite sections to be ATS-optimized while keeping all information truthful."),
-        HumanMessage(content=prompt)
-    ])
-    return response.content.strip()
-
-
-def rewrite_full_resume(resume_sections: dict, jd_text: str, missing_skills: list) -> dict:
-    """Rewrite all resume sections."""
-    rewritten = {}
-    
-    sections_to_rewrite = ["summary", "experience", "skills", "projects"]
-    
-    for section_name, section_text in resume_sections.items():
-        if section_name in sections_to_rewrite and section_text.strip():
-            rewritten[section_name] = rewrite_section(
-                section_name, section_text, jd_text, missing_skills
-            )
-        else:
-            rewritten[section_name] = section_text
-    
-    return rewritten
-
-
-def generate_summary(resume_text: str, jd_text: str) -> str:
-    """Generate a tailored professional summary."""
-    llm = get_llm()
-    
-    prompt = f"""Write a professional summary (3-4 sentences) for this person's resume, tailored to this job.
+SUMMARY_PROMPT = """Write a professional summary (3-4 sentences) for this person's resume, tailored to this job.
 
 RESUME:
-{resume_text[:2000]}
+{resume_text}
 
 JOB DESCRIPTION:
-{jd_text[:1500]}
+{jd_text}
 
 RULES:
 - 3-4 sentences max
@@ -77,8 +45,107 @@ RULES:
 
 Output ONLY the summary. No explanations."""
 
-    response = llm.invoke([
+
+def _rewrite_messages(section_name: str, section_text: str, jd_text: str, missing_skills: list) -> list:
+    """Prompt for rewriting one section, fitted to the token budget.
+
+    The section is sent whole (cutting it would drop it from the rewrite);
+    only the JD is trimmed. A section too long for the budget raises
+    PromptTooLongError with a message for the user.
+    """
+    missing_str = ", ".join(missing_skills) if missing_skills else "none"
+    
+    try:
+        prompt = (
+            PromptBuilder(REWRITE_PROMPT, budget=Config.LLM_PROMPT_BUDGET)
+            .add("jd_text", jd_text, max_tokens=Config.LLM_PROMPT_BUDGET // 4)
+            .render(section_name=section_name.upper(), section_text=section_text, missing_str=missing_str)
+        )
+    except PromptTooLongError as e:
+        raise PromptTooLongError(
+            f"The {section_name} section is too long to rewrite in one go ({e.tokens - e.budget} tokens over the limit). "
+            "Split it into shorter sections, or rewrite it in parts.",
+            e.tokens, e.budget,
+        ) from e
+
+    return [
+        SystemMessage(content="You are a professional resume writer. Rewrite sections to be ATS-optimized while keeping all information truthful."),
+        HumanMessage(content=prompt)
+    ]
+
+
+def rewrite_section(section_name: str, section_text: str, jd_text: str, missing_skills: list) -> str:
+    """Rewrite a single resume section optimized for the JD."""
+    return complete(_rewrite_messages(section_name, section_text, jd_text, missing_skills)).strip()
+
+
+def stream_rewrite_section(section_name: str, section_text: str, jd_text: str, missing_skills: list):
+    """Like `rewrite_section`, but yields tokens as the model produces them."""
+    yield from stream_complete(_rewrite_messages(section_name, section_text, jd_text, missing_skills))
+
+
+def iter_rewrite_sections(sections: dict, jd_text: str, missing_skills: list, max_workers: int = None):
+    """Rewrite several sections concurrently.
+
+    Yields `(section_name, rewritten_text, error)` as each section finishes,
+    at most `max_workers` in flight. A failed section yields its exception
+    instead of text and does not affect the others. Closing the generator
+    early (the user left the page) cancels sections not started yet and
+    returns without waiting for the ones in flight.
+    """
+    max_workers = max(1, max_workers or Config.REWRITE_CONCURRENCY)
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rewrite")
+    try:
+        futures = {
+            pool.submit(rewrite_section, name, text, jd_text, missing_skills): name
+            for name, text in sections.items()
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                yield name, future.result(), None
+            except Exception as e:
+                yield name, None, e
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def rewrite_full_resume(resume_sections: dict, jd_text: str, missing_skills: list) -> dict:
+    """Rewrite all resume sections (in parallel); failed ones keep their original text."""
+    sections_to_rewrite = ["summary", "experience", "skills", "projects"]
+    
+    todo = {
+        name: text for name, text in resume_sections.items()
+        if name in sections_to_rewrite and text.strip()
+    }
+    rewritten = dict(resume_sections)
+    for section_name, text, error in iter_rewrite_sections(todo, jd_text, missing_skills):
+        if error is None:
+            rewritten[section_name] = text
+    
+    return rewritten
+
+
+def _summary_messages(resume_text: str, jd_text: str) -> list:
+    """Prompt for a tailored professional summary, fitted to the token budget."""
+    prompt = (
+        PromptBuilder(SUMMARY_PROMPT, budget=Config.LLM_PROMPT_BUDGET // 2)
+        .add("jd_text", jd_text, priority=2, max_tokens=Config.LLM_PROMPT_BUDGET // 6)
+        .add("resume_text", resume_text, priority=1)
+        .render()
+    )
+
+    return [
         SystemMessage(content="You write concise, ATS-optimized professional summaries."),
         HumanMessage(content=prompt)
-    ])
-    return response.content.strip()
+    ]
+
+
+def generate_summary(resume_text: str, jd_text: str) -> str:
+    """Generate a tailored professional summary."""
+    return complete(_summary_messages(resume_text, jd_text)).strip()
+
+
+def stream_summary(resume_text: str, jd_text: str):
+    """Like `generate_summary`, but yields tokens as the model produces them."""
+    yield from stream_complete(_summary_messages(resume_text, jd_text))
@@ -0,0 +1,218 @@
+"""Sandboxed parsing — uploads are decoded in worker processes with hard limits.
+
+A malformed or huge document can hang pypdf or eat memory. Parsing it in
+a separate process with a wall-clock timeout, an RSS ceiling and a page
+cap means the worst case is one killed worker and a clean error for that
+upload, while other sessions keep being served by the rest of the pool.
+"""
+
+import os
+import queue
+import threading
+import time
+
+from src.blobstore import blob_store
+from src.config import Config
+from src.parser import _decode_resume, extract_text_from_pdf, parse_cache, text_cache_key
+from src.procs import spawn_context
+
+# How often the parent checks a running job for timeout and memory
+POLL_INTERVAL = 0.05
+# A fresh worker must finish importing within this many seconds
+STARTUP_TIMEOUT = 60
+
+
+class ParseError(Exception):
+    """An upload was rejected or could not be parsed. The message is user-facing."""
+
+
+def check_upload_size(size: int):
+    """Reject uploads over PARSE_MAX_UPLOAD_MB before they are read."""
+    limit = Config.PARSE_MAX_UPLOAD_MB * 2**20
+    if size > limit:
+        raise ParseError(f"File is {size / 2**20:.1f} MB; the limit is {Config.PARSE_MAX_UPLOAD_MB:g} MB")
+
+
+def _limit_memory(max_bytes: int):
+    """Address-space backstop for spikes between the parent's RSS checks."""
+    try:
+        import resource
+    except ImportError:
+        return
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (max_bytes, max_bytes))
+    except (ValueError, OSError):
+        pass
+
+
+def _worker_main(conn, max_bytes: int, max_pages: int):
+    """Worker loop: receive (file_bytes, ext), send back ("ok", text) or ("error", message)."""
+    # Interpreter + pypdf already take ~100 MB of address space; leave headroom
+    _limit_memory(2 * max_bytes + 256 * 2**20)
+    conn.send(("ready", None))
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        file_bytes, ext = job
+        try:
+            if ext == ".pdf":
+                text = extract_text_from_pdf(file_bytes, parallel=False, max_pages=max_pages)
+            else:
+                text = _decode_resume(file_bytes, ext, parallel=False)
+            conn.send(("ok", text))
+        except MemoryError:
+            conn.send(("error", "Document needs too much memory to parse"))
+            return
+        except Exception as e:
+            conn.send(("error", str(e) or type(e).__name__))
+
+
+def _rss(pid: int) -> int:
+    """Resident set size of a process in bytes, or 0 where /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+class _Worker:
+    """One parsing subprocess and the pipe to it."""
+
+    def __init__(self, max_bytes: int, max_pages: int):
+        ctx = spawn_context()
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child, max_bytes, max_pages), daemon=True)
+        self.process.start()
+        child.close()
+        self.jobs = 0
+        self.ready = False
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def run(self, file_bytes: bytes, ext: str, timeout: float, max_bytes: int) -> str:
+        """Parse in the worker. Raises ParseError; the worker may be dead afterwards."""
+        self.jobs += 1
+        # Startup (imports) does not count against the job's timeout
+        if not self.ready:
+            try:
+                self.ready = self.conn.poll(STARTUP_TIMEOUT) and self.conn.recv()[0] == "ready"
+            except (OSError, EOFError):
+                pass
+            if not self.ready:
+                self.kill()
+                raise ParseError("Parser worker failed to start, please retry")
+        try:
+            self.conn.send((file_bytes, ext))
+        except (OSError, EOFError):
+            raise ParseError("Parser worker is unavailable, please retry")
+        deadline = time.monotonic() + timeout
+        while not self.conn.poll(POLL_INTERVAL):
+            if time.monotonic() > deadline:
+                self.kill()
+                raise ParseError(f"Parsing took longer than {timeout:g}s; the file may be malformed")
+            if _rss(self.process.pid) > max_bytes:
+                self.kill()
+                raise ParseError(f"Parsing needed more than {max_bytes // 2**20} MB of memory")
+            if not self.alive():
+                raise ParseError("Parser crashed on this file; it may be malformed")
+        try:
+            status, value = self.conn.recv()
+        except (OSError, EOFError):
+            self.kill()
+            raise ParseError("Parser crashed on this file; it may be malformed")
+        if status != "ok":
+            raise ParseError(f"Could not parse file: {value}")
+        return value
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, EOFError):
+            pass
+        self.process.join(timeout=1)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+
+class ParsePool:
+    """Fixed-size pool of parsing workers, shared by all sessions.
+
+    Each job borrows one worker. Workers that time out, exceed the memory
+    limit, crash or reach `max_jobs` are killed and replaced, so a bad file
+    can only ever tie up its own worker for `timeout` seconds.
+    """
+
+    def __init__(self, size: int = None, timeout: float = None, max_rss_mb: int = None,
+                 max_pages: int = None, max_jobs: int = None):
+        self.size = size or Config.PARSE_WORKERS
+        self.timeout = timeout or Config.PARSE_TIMEOUT
+        self.max_bytes = (max_rss_mb or Config.PARSE_MAX_RSS_MB) * 2**20
+        self.max_pages = max_pages or Config.PARSE_MAX_PAGES
+        self.max_jobs = max_jobs or Config.PARSE_WORKER_MAX_JOBS
+        self._idle = queue.Queue()
+        for _ in range(self.size):
+            self._idle.put(self._spawn())
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self.max_bytes, self.max_pages)
+
+    def parse(self, file_bytes: bytes, ext: str) -> str:
+        """Decode a document in a worker. Raises ParseError."""
+        worker = self._idle.get()
+        try:
+            if not worker.alive():
+                worker.kill()
+                worker = self._spawn()
+            return worker.run(file_bytes, ext, self.timeout, self.max_bytes)
+        finally:
+            if not worker.alive() or worker.jobs >= self.max_jobs:
+                worker.stop()
+                worker = self._spawn()
+            self._idle.put(worker)
+
+    def shutdown(self):
+        """Stop every worker; jobs already running finish first."""
+        for _ in range(self.size):
+            self._idle.get().stop()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> ParsePool:
+    """Process-wide parse pool, started on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ParsePool()
+    return _pool
+
+
+def parse_upload(file_bytes: bytes, filename: str) -> str:
+    """Sandboxed `extract_resume_text`: size check, parse cache, then a worker.
+
+    Raises ParseError with a message that can be shown to the user. The
+    text is the blob store's copy when one exists, so storing it in
+    session state does not duplicate what the cache holds.
+    """
+    check_upload_size(len(file_bytes))
+    ext = os.path.splitext(filename)[1].lower()
+    key = text_cache_key(file_bytes, ext)
+    text = parse_cache.get(key)
+    if text is None:
+        text = blob_store.intern(get_parse_pool().parse(file_bytes, ext))
+        parse_cache.set(key, text)
+        return text
+    return blob_store.intern(text)
@@ -0,0 +1,139 @@
+"""Structured output — tolerant JSON repair and per-field validation."""
+
+import json
+import re
+
+# How many cut-back attempts `repair_json` makes on a truncated answer
+MAX_REPAIR_ATTEMPTS = 64
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def _strip_fences(text: str) -> str:
+    """Drop markdown code fences and anything before the first '{'."""
+    text = re.sub(r"```(?:json)?", "", text.strip())
+    start = text.find("{")
+    return text[start:] if start >= 0 else ""
+
+
+def _loads(text: str):
+    """json.loads that ignores trailing garbage after the first value."""
+    try:
+        value, _ = json.JSONDecoder().raw_decode(text)
+        return value
+    except ValueError:
+        return None
+
+
+def repair_json(text: str):
+    """Best-effort parse of a model's JSON object.
+
+    Handles code fences, chatter around the object, trailing commas, and
+    answers cut off mid-string or mid-array (the incomplete tail is dropped
+    and open brackets are closed). Returns a dict, or None if nothing
+    usable is left.
+    """
+    text = _strip_fences(text)
+    if not text:
+        return None
+    value = _loads(text)
+    if isinstance(value, dict):
+        return value
+
+    # Single pass: track strings/brackets, drop trailing commas, and remember
+    # every comma outside a string as a place we can cut back to.
+    out = []
+    stack = []
+    cuts = []
+    in_string = escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            out.append(ch)
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in _CLOSERS:
+            stack.append(ch)
+        elif ch in "}]":
+            if not stack:
+                break
+            stack.pop()
+            if not stack:
+                out.append(ch)
+                break
+        elif ch == ",":
+            if text[i + 1:].lstrip()[:1] in ("}", "]"):
+                continue
+            cuts.append((len(out), list(stack)))
+        out.append(ch)
+
+    tail = '"' if in_string else ""
+    candidates = [("".join(out) + tail, stack)]
+    candidates += [("".join(out[:pos]), st) for pos, st in reversed(cuts)]
+    for body, st in candidates[:MAX_REPAIR_ATTEMPTS]:
+        body = body.rstrip().rstrip(",")
+        value = _loads(body + "".join(_CLOSERS[c] for c in reversed(st)))
+        if isinstance(value, dict):
+            return value
+    return None
+
+
+def _score(value):
+    """0-100 integer from 85, 85.0, "85" or "85%"."""
+    if isinstance(value, str):
+        match = re.search(r"\d+(?:\.\d+)?", value)
+        value = float(match.group()) if match else None
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and 0 <= value <= 100:
+        return round(value)
+    return None
+
+
+def _text(value):
+    return value.strip() if isinstance(value, str) and value.strip() else None
+
+
+def _text_list(value):
+    if isinstance(value, str):
+        value = [value]
+    if isinstance(value, list):
+        items = [v.strip() for v in value if isinstance(v, str) and v.strip()]
+        return items or None
+    return None
+
+
+FIELD_TYPES = {"score": _score, "text": _text, "list": _text_list}
+
+
+def validate_fields(data: dict, schema: dict) -> tuple:
+    """Coerce `data` to `schema` ({field: "score"|"text"|"list"}).
+
+    Returns `(clean, missing)`: the fields that passed, and the names of
+    those that were absent or invalid.
+    """
+    clean, missing = {}, []
+    data = data if isinstance(data, dict) else {}
+    for field, kind in schema.items():
+        value = FIELD_TYPES[kind](data.get(field))
+        if value is None:
+            missing.append(field)
+        else:
+            clean[field] = value
+    return clean, missing
+
+
+def followup_prompt(missing: list, schema: dict) -> str:
+    """Short prompt asking the model to resend only the given fields."""
+    hints = {"score": "<0-100>", "text": "<string>", "list": ["<string>", "..."]}
+    shape = json.dumps({field: hints[schema[field]] for field in missing}, indent=4)
+    return (
+        "Your previous answer was missing or had invalid values for these fields: "
+        f"{', '.join(missing)}.\n\n"
+        f"Reply with ONLY a JSON object containing exactly these keys:\n{shape}\n\n"
+        "No markdown, no explanation."
+    )
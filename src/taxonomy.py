@@ -0,0 +1,143 @@
+"""Skill taxonomy — canonical skills, aliases and categories from a versioned JSON file.
+
+The file (TAXONOMY_PATH, data/taxonomy.json by default) looks like:
+
+    {
+      "version": "2026.10.1",
+      "skills": [
+        {"name": "kubernetes", "type": "hard", "category": "devops", "aliases": ["k8s"]},
+        {"name": "teamwork", "type": "soft", "category": "soft"}
+      ],
+      "action_verbs": ["managed", "developed", "led"]
+    }
+
+It is compiled once into a SkillMatcher (one trie-shaped regex, so match
+cost follows skill length rather than taxonomy size) and reloaded in the
+background when the file changes; requests keep using the previous version
+until the new one is ready.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+
+from src import metrics
+from src.config import Config
+from src.matcher import SkillMatcher
+
+SKILL_TYPES = ("hard", "soft")
+
+
+class Taxonomy:
+    """A loaded, validated taxonomy and the matchers compiled from it."""
+
+    def __init__(self, data: dict):
+        self.version = str(data.get("version", ""))
+        self.hard_skills, self.soft_skills = [], []
+        self.aliases, self.categories = {}, {}
+        for entry in data.get("skills", []):
+            name = entry["name"].lower()
+            kind = entry.get("type", "hard")
+            if kind not in SKILL_TYPES:
+                raise ValueError(f"Skill {name!r} has unknown type {kind!r}")
+            if name in self.categories:
+                raise ValueError(f"Duplicate skill {name!r}")
+            (self.hard_skills if kind == "hard" else self.soft_skills).append(name)
+            self.categories[name] = entry.get("category")
+            for alias in entry.get("aliases", []):
+                alias = alias.lower()
+                if self.aliases.get(alias, name) != name:
+                    raise ValueError(f"Alias {alias!r} is claimed by {self.aliases[alias]!r} and {name!r}")
+                self.aliases[alias] = name
+        clash = set(self.aliases) & set(self.categories)
+        if clash:
+            raise ValueError(f"Aliases that are also skills: {sorted(clash)}")
+
+        self.matcher = SkillMatcher(self.hard_skills, self.soft_skills, self.aliases)
+        self.action_verbs = [v.lower() for v in data.get("action_verbs", [])]
+        # Lookahead so overlapping verbs are all seen, like separate substring checks
+        self.verb_pattern = re.compile("(?=(" + "|".join(map(re.escape, self.action_verbs)) + "))") if self.action_verbs else None
+
+    def __len__(self):
+        return len(self.categories)
+
+    def canonical(self, term: str) -> str:
+        """Canonical skill for a name or alias (the term itself if unknown)."""
+        term = term.lower()
+        return self.aliases.get(term, term)
+
+    def category(self, skill: str):
+        return self.categories.get(self.canonical(skill))
+
+
+def load_taxonomy(path: str = None) -> Taxonomy:
+    """Read and compile a taxonomy file. Raises OSError or ValueError."""
+    with open(path or Config.TAXONOMY_PATH, encoding="utf-8") as f:
+        return Taxonomy(json.load(f))
+
+
+_current = None
+_mtime = None
+_checked_at = 0.0
+_reloading = False
+_lock = threading.Lock()
+
+
+def get_taxonomy() -> Taxonomy:
+    """The current taxonomy, loading it on first use.
+
+    At most every TAXONOMY_CHECK_INTERVAL seconds the file's mtime is
+    checked; a change starts a background reload and this call returns the
+    version already in memory.
+    """
+    global _current, _mtime, _checked_at, _reloading
+    if _current is None:
+        with _lock:
+            if _current is None:
+                _mtime = os.stat(Config.TAXONOMY_PATH).st_mtime
+                _current = load_taxonomy()
+                _checked_at = time.monotonic()
+        return _current
+
+    now = time.monotonic()
+    if now - _checked_at >= Config.TAXONOMY_CHECK_INTERVAL:
+        with _lock:
+            _checked_at = now
+            try:
+                mtime = os.stat(Config.TAXONOMY_PATH).st_mtime
+            except OSError:
+                mtime = _mtime
+            if mtime != _mtime and not _reloading:
+                _reloading = True
+                threading.Thread(target=_reload, args=(mtime,), daemon=True).start()
+    return _current
+
+
+def _reload(mtime: float):
+    """Compile the changed file off the request path, then swap it in."""
+    global _current, _mtime, _reloading
+    try:
+        taxonomy = load_taxonomy()
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        # Keep serving the old version; don't retry until the file changes again
+        metrics.incr("taxonomy.reload_errors")
+        metrics.record("taxonomy.reload", ok=False, error=str(e))
+        taxonomy = None
+    with _lock:
+        if taxonomy is not None:
+            _current = taxonomy
+            metrics.incr("taxonomy.reloads")
+            metrics.record("taxonomy.reload", ok=True, version=taxonomy.version, skills=len(taxonomy))
+        _mtime = mtime
+        _reloading = False
+
+
+def reload_taxonomy() -> Taxonomy:
+    """Reload the file now, synchronously (errors propagate)."""
+    global _current, _mtime
+    with _lock:
+        _mtime = os.stat(Config.TAXONOMY_PATH).st_mtime
+        _current = load_taxonomy()
+        return _current
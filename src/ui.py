@@ -147,3 +147,16 @@ def score_emoji(score: int) -> str:
     elif score >= 50:
         return "⚠️"
     return "❌"
+
+
+def stream_text(container, tokens) -> str:
+    """Render a token stream live into `container` and return the full text."""
+    parts = []
+
+    def collect():
+        for token in tokens:
+            parts.append(token)
+            yield token
+
+    container.write_stream(collect())
+    return "".join(parts).strip()
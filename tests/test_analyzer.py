@@ -0,0 +1,50 @@
+"""Batch ranking: stays out of parse_cache and runs the top-k LLM analyses concurrently."""
+
+import asyncio
+import json
+import time
+
+from src import analyzer, parser
+
+JD = "Backend engineer: Python, Django, PostgreSQL, Docker, AWS. Strong communication."
+
+
+def resume(i: int) -> dict:
+    skills = ["Python", "Django", "PostgreSQL", "Docker", "AWS"][: 1 + i % 5]
+    text = (
+        f"Candidate {i}\ncandidate{i}@example.com\nExperience\n- Built services with {', '.join(skills)}, "
+        f"cut latency by {10 + i}%\nEducation\nBSc Computer Science\nSkills\n{', '.join(skills)}"
+    )
+    return {"id": i, "filename": f"r{i}.pdf", "text": text}
+
+
+def test_rank_resumes_bypasses_parse_cache_and_overlaps_llm_calls(monkeypatch):
+    cached = []
+    monkeypatch.setattr(parser.parse_cache, "set", lambda key, value: cached.append(key))
+    in_flight, peak = 0, 0
+
+    async def fake_analysis(resume_text, jd_text):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.3)
+        in_flight -= 1
+        return {"experience_relevance_score": 90, "education_score": 80}
+
+    monkeypatch.setattr(analyzer, "analyze_with_llm_async", fake_analysis)
+    resumes = [resume(i) for i in range(20)]
+
+    started = time.monotonic()
+    board = analyzer.rank_resumes(JD, resumes, llm_top_k=4)
+    assert time.monotonic() - started < 1.0
+    assert peak == 4
+    assert len(board) == 20 and sum(row["llm_analysis"] is not None for row in board) == 4
+    assert board[0]["experience_score"] == 90
+    # At most the JD's own entries; nothing per resume
+    assert len(cached) < 5
+
+
+def test_leaderboard_without_ids_is_json_serializable():
+    resumes = [{k: v for k, v in resume(i).items() if k != "id"} for i in range(5)]
+    board = analyzer.rank_resumes(JD, resumes, llm_top_k=0)
+    assert sorted(row["id"] for row in json.loads(json.dumps(board))) == list(range(5))
@@ -0,0 +1,38 @@
+"""Resume documents share the blob store's copy of their text, and memory is counted once."""
+
+import pytest
+
+from src.blobstore import store_text
+from src.document import clear_documents, get_document, memory_footprint
+
+TEXT = "Jane Doe\nExperience\n" + "- Built data pipelines in Python and SQL\n" * 3000
+
+
+@pytest.fixture(autouse=True)
+def documents():
+    clear_documents()
+    yield
+    clear_documents()
+
+
+def test_document_uses_the_stored_text():
+    ref = store_text(TEXT)
+    copy = "".join(list(TEXT))
+    assert copy == TEXT and copy is not TEXT
+    doc = get_document(copy)
+    assert doc.text is ref.text
+    assert get_document(ref) is doc
+
+
+def test_footprint_counts_shared_text_once():
+    ref = store_text(TEXT)
+    before = memory_footprint()
+    doc = get_document("".join(list(TEXT)))
+    after = memory_footprint()
+    assert after["documents"] == before["documents"] + 1
+    assert after["document_bytes"] - before["document_bytes"] < len(TEXT) // 10
+    doc.lower
+    grown = memory_footprint()
+    assert grown["document_bytes"] - after["document_bytes"] >= len(TEXT)
+    assert grown["total_bytes"] == grown["blob_bytes"] + grown["parse_cache_bytes"] + grown["document_bytes"]
+    del ref
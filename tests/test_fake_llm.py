@@ -0,0 +1,15 @@
+"""Fake LLM server: replies in JSON only when the request asks for it."""
+
+from benchmarks.fake_llm import _wants_json
+from src.analyzer import ANALYSIS_PROMPT
+
+
+def test_mentioning_json_is_not_asking_for_it():
+    prompt = "Rewrite this experience section:\n- Built REST APIs returning JSON\nSkills: JSON, YAML"
+    assert not _wants_json({}, prompt)
+    assert _wants_json({"response_format": {"type": "json_object"}}, prompt)
+
+
+def test_explicit_instruction_asks_for_json():
+    assert _wants_json({}, ANALYSIS_PROMPT)
+    assert _wants_json({}, "Reply with ONLY a JSON object containing exactly these keys:")
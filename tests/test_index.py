@@ -0,0 +1,88 @@
+"""ResumeIndex search: same top-k as scoring every resume, through deletes and reloads."""
+
+import random
+
+import pytest
+
+from src.index import APPLIED_BONUS, HARD_WEIGHT, SOFT_WEIGHT, ResumeIndex
+
+HARD = [f"hard{i}" for i in range(40)]
+SOFT = [f"soft{i}" for i in range(6)]
+
+
+def brute_force(resumes: dict, query: dict) -> dict:
+    """Score of every resume, computed directly from its skill sets."""
+    hard, soft = query["hard_skills"], query["soft_skills"]
+    total = (HARD_WEIGHT if hard else 0) + (SOFT_WEIGHT if soft else 0)
+    scores = {}
+    for rid, (skills, applied) in resumes.items():
+        score = 0.0
+        for group, weight in ((hard, HARD_WEIGHT), (soft, SOFT_WEIGHT)):
+            for skill in group:
+                if skill in skills:
+                    score += weight / len(group) * (1 + APPLIED_BONUS * (skill in applied)) / (1 + APPLIED_BONUS)
+        scores[rid] = score / total * 100
+    return scores
+
+
+def check(index: ResumeIndex, resumes: dict, query: dict, k: int):
+    expected = brute_force(resumes, query)
+    results = index.search(query, k)
+    best = sorted((s for s in expected.values() if s > 0), reverse=True)[:k]
+    assert [s for _, s in results] == pytest.approx(best, abs=0.051)
+    for rid, score in results:
+        assert score == pytest.approx(expected[rid], abs=0.051)
+
+
+@pytest.fixture
+def corpus():
+    rng = random.Random(5)
+    weights = [1 / (rank + 1) for rank in range(len(HARD))]
+    resumes = {}
+    for i in range(3000):
+        skills = set(rng.choices(HARD, weights=weights, k=rng.randint(1, 12))) | set(rng.sample(SOFT, rng.randint(0, 3)))
+        resumes[f"r{i}"] = (skills, {s for s in skills if rng.random() < 0.4})
+    index = ResumeIndex()
+    for rid, (skills, applied) in resumes.items():
+        index.add_skills(rid, skills, applied)
+    return index, resumes, rng
+
+
+def queries(rng, count=40):
+    for _ in range(count):
+        yield {"hard_skills": rng.sample(HARD, rng.randint(1, 12)), "soft_skills": rng.sample(SOFT, rng.randint(0, 3))}
+
+
+def test_search_matches_brute_force(corpus):
+    index, resumes, rng = corpus
+    for query in queries(rng):
+        check(index, resumes, query, rng.choice([1, 10, 50, 5000]))
+
+
+def test_search_after_deletes_and_compaction(corpus):
+    index, resumes, rng = corpus
+    for i in range(0, 3000, 3):
+        assert index.delete(f"r{i}")
+        del resumes[f"r{i}"]
+    for query in queries(rng, 20):
+        check(index, resumes, query, 10)
+
+
+def test_search_after_save_and_load(corpus, tmp_path):
+    index, resumes, rng = corpus
+    index.delete("r1")
+    del resumes["r1"]
+    index.save(str(tmp_path / "index.npz"))
+    loaded = ResumeIndex.load(str(tmp_path / "index.npz"))
+    loaded.add_skills("new", {"hard0", "hard1"}, {"hard0"})
+    resumes["new"] = ({"hard0", "hard1"}, {"hard0"})
+    for query in queries(rng, 20):
+        check(loaded, resumes, query, 10)
+
+
+def test_unknown_skills_and_empty_index():
+    assert ResumeIndex().search({"hard_skills": ["python"]}) == []
+    index = ResumeIndex()
+    index.add_skills("a", {"python"})
+    assert index.search({"hard_skills": ["cobol"], "soft_skills": []}) == []
+    assert index.search({"hard_skills": ["python", "cobol"]}) == [("a", 40.0)]
@@ -0,0 +1,53 @@
+"""Bulk ingestion: a file that hangs its parser is recorded as an error and the run goes on."""
+
+import json
+import time
+
+from src import ingest, parser, sandbox
+
+
+def _hangs_on_stuck(conn, max_bytes, max_pages):
+    """Parse worker stand-in: echoes text files, never answers for ones containing STUCK."""
+    conn.send(("ready", None))
+    while True:
+        job = conn.recv()
+        if job is None:
+            return
+        file_bytes, _ = job
+        if b"STUCK" in file_bytes:
+            time.sleep(3600)
+        conn.send(("ok", file_bytes.decode()))
+
+
+def records(path) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return {r["id"]: r for r in map(json.loads, f)}
+
+
+def test_stuck_file_is_an_error_and_checkpointed(tmp_path, monkeypatch):
+    monkeypatch.setattr(sandbox, "_worker_main", _hangs_on_stuck)
+    dump = tmp_path / "dump"
+    dump.mkdir()
+    for name in ("a", "b", "c"):
+        (dump / f"{name}.txt").write_text(f"Jane {name.upper()}\nSkills\nPython, SQL")
+    (dump / "stuck.txt").write_text("STUCK")
+    output = tmp_path / "parsed.jsonl"
+
+    def no_caching(key, value):
+        raise AssertionError("ingest must not fill parse_cache")
+
+    monkeypatch.setattr(parser.parse_cache, "set", no_caching)
+
+    started = time.monotonic()
+    summary = ingest.ingest([str(dump)], str(output), workers=2, timeout=1, progress_every=3600)
+    assert time.monotonic() - started < 30
+    assert summary["ok"] == 3 and summary["errors"] == 1
+
+    parsed = records(output)
+    stuck = parsed[str(dump / "stuck.txt")]
+    assert stuck["status"] == "error" and "longer than 1s" in stuck["error"]
+    assert parsed[str(dump / "a.txt")]["sections"]["skills"] == "Python, SQL"
+
+    # The stuck file is in the checkpoint: a re-run has nothing left to do
+    again = ingest.ingest([str(dump)], str(output), workers=1, timeout=1)
+    assert again["skipped"] == 4 and again["ok"] == again["errors"] == 0
@@ -0,0 +1,21 @@
+"""Job queue: finished jobs expire after the retention period, even with no new submissions."""
+
+import time
+
+from src.jobs import DONE, JobQueue
+
+
+def test_expired_jobs_are_pruned_on_lookup():
+    queue = JobQueue(workers=1, max_pending=10, retention=0.2)
+    try:
+        job = queue.submit(lambda job: "result")
+        deadline = time.monotonic() + 5
+        while not job.done and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert job.status == DONE and queue.get(job.id) is job
+        time.sleep(0.3)
+        assert queue.stats()["queued"] == 0
+        assert job.id not in queue._jobs
+        assert queue.get(job.id) is None
+    finally:
+        queue.shutdown()
@@ -0,0 +1,120 @@
+"""LLM client: one connection pool pair per provider, and JSON mode dropped only when the provider refuses it."""
+
+import gc
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from openai import BadRequestError
+
+from src import llm
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    llm.reset_llm_clients()
+    monkeypatch.setenv("LLM_BASE_URL", "http://provider-a.invalid/v1")
+    monkeypatch.setenv("LLM_API_KEY", "key-a")
+    yield monkeypatch
+    llm.reset_llm_clients()
+
+
+def test_clients_share_one_pool_per_provider(provider):
+    plain, streaming = llm.get_llm(0.1), llm.get_llm(0.7, streaming=True)
+    assert plain is not streaming
+    assert plain.http_client is streaming.http_client
+    assert plain.http_async_client is streaming.http_async_client
+    provider.setenv("LLM_MODEL", "another-model")
+    assert llm.get_llm(0.1).http_client is plain.http_client
+
+
+@pytest.fixture
+def slow_server():
+    class Slow(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(0.3)
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Slow)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+
+
+def test_switching_provider_lets_in_flight_calls_finish(provider, slow_server):
+    old = llm.get_llm(0.1)
+    with ThreadPoolExecutor(2) as pool:
+        sync_call = pool.submit(old.http_client.get, slow_server)
+        async_call = pool.submit(llm.run_sync, old.http_async_client.get(slow_server))
+        time.sleep(0.1)
+        provider.setenv("LLM_BASE_URL", "http://provider-b.invalid/v1")
+        new = llm.get_llm(0.1)
+        llm.reset_llm_clients()
+        assert sync_call.result().text == async_call.result().text == "ok"
+    assert new.http_client is not old.http_client
+    assert not old.http_client.is_closed and not old.http_async_client.is_closed
+
+
+def test_dropped_pools_are_released(provider):
+    released = weakref.ref(llm.get_llm(0.1).http_client)
+    provider.setenv("LLM_BASE_URL", "http://provider-b.invalid/v1")
+    llm.get_llm(0.1)
+    gc.collect()
+    assert released() is None
+
+
+def test_reset_builds_fresh_clients(provider):
+    client = llm.get_llm(0.1).http_client
+    llm.reset_llm_clients()
+    assert llm.get_llm(0.1).http_client is not client
+
+
+def bad_request(body) -> BadRequestError:
+    request = httpx.Request("POST", "http://provider-a.invalid/v1/chat/completions")
+    response = httpx.Response(400, request=request)
+    return BadRequestError(f"Error code: 400 - {body}", response=response, body=body)
+
+
+class FakeLLM:
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return AIMessage(content='{"ok": true}')
+
+
+@pytest.mark.parametrize("body, json_mode_problem", [
+    ({"message": "response_format is not supported by this model", "param": "response_format"}, True),
+    ({"message": "Invalid value for 'response_format.type': 'json_object'"}, True),
+    ("json mode is not available for this model", True),
+    ({"message": "This model's maximum context length is 8192 tokens", "param": "messages"}, False),
+    ({"message": "Invalid 'messages[1].content': string too long"}, False),
+])
+def test_only_response_format_errors_fall_back(provider, body, json_mode_problem):
+    bound, plain = FakeLLM(bad_request(body)), FakeLLM()
+    provider.setattr(llm, "_runnable", lambda temperature, json_mode: (bound, True))
+    provider.setattr(llm, "get_llm", lambda temperature=0.1, streaming=False: plain)
+    provider.setattr(llm, "_json_mode_unsupported", set())
+    messages = [HumanMessage(content="Return JSON")]
+    if json_mode_problem:
+        assert llm._call(messages, 0.1, lambda text: False, True, "key") == '{"ok": true}'
+        assert plain.calls == 1 and llm._json_mode_unsupported
+    else:
+        with pytest.raises(BadRequestError):
+            llm._call(messages, 0.1, lambda text: False, True, "key")
+        assert plain.calls == 0 and not llm._json_mode_unsupported
@@ -0,0 +1,24 @@
+"""SkillMatcher: aliases don't fire inside dotted names."""
+
+import pytest
+
+from src.matcher import SkillMatcher
+from src.parser import get_skill_matcher
+
+
+@pytest.mark.parametrize("text, skills", [
+    ("Backend developer, Node.js and Express", {"node", "express"}),
+    ("Next.js, Nest.js and Vue.js", {"next.js", "nest.js", "vue"}),
+    ("JS, HTML and CSS", {"javascript", "html", "css"}),
+    ("Wrote vanilla js.", {"javascript"}),
+    ("C++/JS tooling", {"c++", "javascript"}),
+    ("ASP.NET Core services", {".net"}),
+])
+def test_taxonomy_matches(text, skills):
+    assert get_skill_matcher().find(text) == skills
+
+
+def test_node_js_is_not_javascript():
+    matcher = SkillMatcher(hard_skills=["javascript", "node"], aliases={"js": "javascript", "node.js": "node"})
+    assert matcher.find("node.js") == {"node"}
+    assert matcher.find("node, js") == {"node", "javascript"}
@@ -0,0 +1,53 @@
+"""Worker processes must not re-run the Streamlit page script on startup."""
+
+import sys
+import types
+
+import pytest
+
+from src import parser
+from src.procs import spawn_context
+from src.sandbox import ParsePool
+
+
+@pytest.fixture
+def streamlit_main(tmp_path, monkeypatch):
+    """Stand-in for Streamlit's `__main__`: no spec, `__file__` is the page script."""
+    marker = tmp_path / "page_ran"
+    script = tmp_path / "page.py"
+    script.write_text(f"open({str(marker)!r}, 'w').write('ran')\n")
+    main = types.ModuleType("__main__")
+    main.__file__ = str(script)
+    monkeypatch.setitem(sys.modules, "__main__", main)
+    return main, marker
+
+
+def _square(x):
+    return x * x
+
+
+def test_parse_worker_does_not_run_page_script(streamlit_main):
+    main, marker = streamlit_main
+    pool = ParsePool(size=1, timeout=30)
+    try:
+        assert pool.parse(b"Jane Doe\nPython developer", ".txt") == "Jane Doe\nPython developer"
+    finally:
+        pool.shutdown()
+    assert not marker.exists()
+    assert main.__file__.endswith("page.py")
+
+
+def test_pdf_pool_does_not_run_page_script(streamlit_main, monkeypatch):
+    _, marker = streamlit_main
+    monkeypatch.setattr(parser, "_pdf_pool", None)
+    pool = parser._get_pdf_pool()
+    try:
+        assert list(pool.map(_square, [2, 3])) == [4, 9]
+    finally:
+        pool.shutdown()
+        parser._reset_pdf_pool()
+    assert not marker.exists()
+
+
+def test_spawn_context_is_spawn():
+    assert spawn_context().get_start_method() == "spawn"
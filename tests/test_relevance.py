@@ -0,0 +1,82 @@
+"""Relevance gate: obvious mismatches fall below the default threshold, real matches don't."""
+
+from src.config import Config
+from src.relevance import score_relevance
+
+KUBERNETES_JD = """Senior Platform Engineer
+Requirements: 5+ years of experience, Bachelor's degree in computer science.
+Own our Kubernetes clusters on AWS, write Terraform, build CI/CD pipelines with Jenkins and GitHub Actions,
+run Docker workloads, Python and Go tooling, Prometheus monitoring, Linux administration, on-call.
+Strong communication, teamwork and problem solving skills."""
+
+NURSE_RESUME = """Mary Smith
+mary@example.com | +1 555 123 4567
+Summary
+Registered nurse with 8 years of experience in acute care and emergency departments.
+Experience
+- Provided patient care for up to 6 patients per shift in a 30-bed ICU
+- Administered medications, monitored vital signs, and coordinated with physicians
+- Trained new nursing staff on triage protocols and electronic health records
+Education
+Bachelor of Science in Nursing, State University
+Certifications
+BLS, ACLS, PALS
+Skills
+Communication, teamwork, leadership, problem solving"""
+
+DEVOPS_RESUME = """Alex Kim
+Experience
+- Ran production Kubernetes clusters on AWS with Terraform and Helm
+- Built CI/CD pipelines in Jenkins and GitHub Actions for Docker services
+- Wrote Python and Go tooling; Prometheus and Grafana monitoring; Linux on-call
+Skills
+Kubernetes, Docker, AWS, Terraform, Python, Go, Linux, communication
+Education
+B.S. Computer Science"""
+
+DATA_JD = """Data Engineer
+We are looking for a data engineer to design and operate our streaming and batch data platform.
+Requirements: 3+ years building data pipelines with Apache Spark, Kafka and Airflow.
+Strong Python and SQL, experience with data warehouses (Snowflake or BigQuery), AWS.
+You will own ETL jobs, data modeling, and data quality monitoring. Good communication skills."""
+
+# Same field, different wording: the experience section never says "data" or "pipeline"
+DATA_RESUME = """Priya Patel
+priya.patel@example.com | +1 555 987 6543 | linkedin.com/in/priyapatel
+Summary
+Engineer focused on reliable ingestion and analytics infrastructure for a fintech company.
+Experience
+Senior Engineer, Ledgerly (2020-2024)
+- Moved nightly batch ETL onto streaming ingestion, cutting reporting latency from hours to minutes
+- Designed dimensional models for finance reporting used by 40 analysts
+- Scheduled and monitored 120 workflows, with alerting for late or malformed loads
+Analyst, Northwind (2017-2020)
+- Automated reconciliation reports and cleaned up legacy stored procedures
+Education
+B.S. Information Systems
+Skills
+Python, SQL, Kafka, Spark, Airflow, PostgreSQL, Git"""
+
+
+def test_nurse_resume_is_below_threshold_for_kubernetes_jd():
+    assert score_relevance(NURSE_RESUME, KUBERNETES_JD)["score"] < Config.RELEVANCE_THRESHOLD
+
+
+def test_matching_resume_is_above_threshold():
+    assert score_relevance(DEVOPS_RESUME, KUBERNETES_JD)["score"] > 2 * Config.RELEVANCE_THRESHOLD
+
+
+def test_near_match_in_different_words_is_above_threshold():
+    assert score_relevance(DATA_RESUME, DATA_JD)["score"] > 2 * Config.RELEVANCE_THRESHOLD
+
+
+def test_shared_soft_skills_do_not_count():
+    result = score_relevance(NURSE_RESUME, KUBERNETES_JD)
+    assert result["sections"]["skills"] == 0
+    assert result["score"] < Config.RELEVANCE_THRESHOLD
+
+
+def test_header_does_not_dilute_score():
+    result = score_relevance(DATA_RESUME, DATA_JD)
+    assert result["sections"]["header"] == 0
+    assert result["score"] > result["resume"]
@@ -0,0 +1,46 @@
+"""Rewriter: sections always go in whole, and closing a batch stops its pending work."""
+
+import time
+
+import pytest
+
+from src import rewriter
+from src.config import Config
+from src.prompt import PromptTooLongError, count_tokens
+from src.rewriter import _rewrite_messages
+
+JD = "Kubernetes Terraform AWS platform engineering on-call " * 400
+
+
+def test_long_section_is_kept_whole_and_jd_trimmed():
+    section = "\n".join(f"- Migrated service {i} to Kubernetes with zero downtime" for i in range(150))
+    assert count_tokens(section) > Config.LLM_PROMPT_BUDGET // 2
+    prompt = _rewrite_messages("experience", section, JD, ["helm"])[1].content
+    assert section in prompt
+    assert count_tokens(prompt) <= Config.LLM_PROMPT_BUDGET
+    assert JD.strip() not in prompt
+
+
+def test_section_over_budget_raises():
+    section = "Led cross-functional delivery of platform migrations. " * 600
+    with pytest.raises(PromptTooLongError, match="experience section is too long"):
+        _rewrite_messages("experience", section, JD, [])
+
+
+def test_closing_iter_rewrite_sections_cancels_pending(monkeypatch):
+    started = []
+
+    def slow_rewrite(name, text, jd_text, missing_skills):
+        started.append(name)
+        time.sleep(0.5)
+        return text.upper()
+
+    monkeypatch.setattr(rewriter, "rewrite_section", slow_rewrite)
+    sections = {f"section{i}": "text" for i in range(10)}
+    results = rewriter.iter_rewrite_sections(sections, "jd", [], max_workers=2)
+    next(results)
+    closed = time.monotonic()
+    results.close()
+    assert time.monotonic() - closed < 0.3
+    time.sleep(0.7)
+    assert len(started) <= 4